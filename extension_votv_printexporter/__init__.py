@@ -13,92 +13,1091 @@
 
 import bpy
 import os
-import mathutils
+import json
+import hashlib
+import shutil
+import time
+import csv
+import re
+import subprocess
+import tempfile
+import cProfile
 import numpy as np
+from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from . import atlas, costs, hull, imageops, objwriter, pngwriter, vertexcache
+from .batch_export import parse_override
+
+PRINTABLE_TYPES = {'MESH', 'CURVE', 'SURFACE', 'FONT', 'META'}
+
+# Scene written to the snapshot .blend that worker processes export from
+SNAPSHOT_SCENE_NAME = "VOTV_Snapshot"
+# Console line the exporter prints for every finished print, counted for the progress bar
+FINISHED_PRINT_LINE = re.compile(r"^.+: (up to date|\d+ collision object\(s\))", re.MULTILINE)
+
+SCRATCH_IMAGE_NAME = "VOTV_CombinedImage"
+RESIZED_IMAGE_NAME = "VOTV_ResizedImage"
+DECIMATE_OBJECT_NAME = "VOTV_Decimated"
+
+# Left behind by exports that crashed, or by older versions of the exporter
+STALE_DATABLOCKS = (
+    ("images", (SCRATCH_IMAGE_NAME, RESIZED_IMAGE_NAME, "CombinedImage")),
+    ("objects", (DECIMATE_OBJECT_NAME,)),
+    ("meshes", (DECIMATE_OBJECT_NAME,)),
+)
+TILE_PIXELS = 1 << 20
+TEXTURE_MANIFEST_NAME = ".votv_textures.json"
+STAGING_PREFIX = ".votv_partial_"
+TEXTURE_STORE_NAME = ".votv_texture_store"
+TIMING_LOG_NAME = "votv_export_timings.log"
+PRINT_MANIFEST_NAME = ".votv_print.json"
+
+# Bump when the exporter's output changes so every print gets written again once
+FINGERPRINT_VERSION = 1
+
+# Print settings that change what gets written, on top of the properties file
+FINGERPRINT_SETTINGS = ("sizelimit", "limitbypass", "triangle_budget", "collision_hulls", "collision_hull_vertices", "collision_hull_count",
+                        "export_mode", "texture_atlas", "optimize_vertex_cache", "compact_obj", "obj_precision")
+
+# VOTVProperties fields that end up in properties.cfg, the ones a variant table may override
+PROPERTIES_FILE_FIELDS = {"physical_material", "emissive_strength", "lamp", "lamp_color", "lamp_offset", "lamp_intensity", "lamp_attenuation",
+                          "lamp_shadows", "health", "impact_resistance", "damage_resistance", "lamp_toggle"}
+
+# Order the export stages are reported in
+EXPORT_STAGES = ("fingerprint", "size_check", "atlas", "geometry", "textures", "properties", "commit")
+
+# Blender's Z-up to the Y-up, -Z forward axes the built-in OBJ exporter uses
+OBJ_AXIS_CONVERSION = np.array((
+    (1.0, 0.0, 0.0, 0.0),
+    (0.0, 0.0, 1.0, 0.0),
+    (0.0, -1.0, 0.0, 0.0),
+    (0.0, 0.0, 0.0, 1.0),
+))
+
+NAVIGATION_EVENTS = {'MIDDLEMOUSE', 'WHEELUPMOUSE', 'WHEELDOWNMOUSE', 'TRACKPADPAN', 'TRACKPADZOOM', 'MOUSEMOVE', 'INBETWEEN_MOUSEMOVE'}
+
+# Image depth (bits per pixel) of byte images -> PNG channel count
+PNG_PLANES = {8: 1, 24: 3, 32: 4}
+
+# Texture types an atlas is made of, and the colour of a tile whose material has no such texture
+ATLAS_TYPES = ("diffuse", "normal", "emissive", "pbr")
+ATLAS_FILL = {"diffuse": (255, 255, 255, 255), "normal": (128, 128, 255, 255), "emissive": (0, 0, 0, 255), "pbr": (0, 0, 0, 255)}
+
+# Outcome of the last ExportButton run, read back by the batch exporter
+last_export_summary = {}
+
+# Results of the last Analyze run, one dict per print, drawn by the analysis panel
+last_print_analysis = []
+
+# State of the running modal export, drawn by the main panel
+export_progress = {"running": False, "factor": 0.0, "text": ""}
+
+# ExportSession of the running export, None otherwise
+export_session = None
 
 #
 # Function Used
 #
 
+def run_steps(steps):
+    # Drives one of the *_steps generators to the end and returns its result
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+def timed_steps(timings, stage, steps):
+    # Same as "yield from steps", but only the time spent inside steps is added to
+    # timings[stage], not the time the modal export waits between steps
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                label = next(steps)
+            except StopIteration as done:
+                return done.value
+            finally:
+                timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - started
+            yield label
+    finally:
+        steps.close()
+
+@contextmanager
+def timed_stage(timings, stage):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - started
+
+def profiled_steps(profiler, steps, profile_path):
+    # The profiler only runs while a step does, then the stats go to profile_path()
+    try:
+        while True:
+            profiler.enable()
+            try:
+                label = next(steps)
+            except StopIteration as done:
+                return done.value
+            finally:
+                profiler.disable()
+            yield label
+    finally:
+        steps.close()
+        try:
+            profiler.dump_stats(profile_path())
+        except OSError:
+            print("Could not write the export profile")
+
+def format_timings(timings):
+    return ", ".join(f"{stage} {timings[stage]:.2f} s" for stage in EXPORT_STAGES if stage in timings)
+
+def append_timing_log(export_path, summary):
+    lines = []
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    for name in summary["exported"]:
+        timings = summary["print_stats"][name].get("timings", {})
+        stages = " ".join(f"{stage}={timings[stage]:.4f}" for stage in EXPORT_STAGES if stage in timings)
+        lines.append(f"{timestamp} {summary['mode']} {name} {stages}\n")
+    lines.append(f"{timestamp} {summary['mode']} total={summary['seconds']:.4f} texture_wait={summary['texture_wait']:.4f}\n")
+
+    try:
+        with open(os.path.join(export_path, TIMING_LOG_NAME), 'a') as f:
+            f.writelines(lines)
+    except OSError:
+        print("Could not write the export timing log")
+
 def saveImage(exportpath, image):
     try:
         image.file_format = "PNG"
         image.save(filepath=exportpath)
+        return True
     except Exception as e:
         print(f"Failed to save image {exportpath}: {e}")
+        return False
 
-def exportOBJMaterials(obj, exportpath):
-    for material in obj.data.materials:
+def image_content_hash(image, *extra):
+    width, height = image.size
+    pixels = pixel_buffer(width * height * image.channels)
+    image.pixels.foreach_get(pixels)
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{width}x{height}x{image.channels}".encode())
+    digest.update(memoryview(pixels))
+    for value in extra:
+        digest.update(f"|{value}".encode())
+    return digest.hexdigest()
+
+def load_texture_manifest(exportpath):
+    try:
+        with open(os.path.join(exportpath, TEXTURE_MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_texture_manifest(exportpath, manifest):
+    try:
+        with open(os.path.join(exportpath, TEXTURE_MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+    except OSError as e:
+        print(f"Failed to write texture manifest in {exportpath}: {e}")
+
+def texture_is_current(manifest, texture_path, content_hash):
+    return manifest.get(os.path.basename(texture_path)) == content_hash and os.path.exists(texture_path)
+
+def can_encode_pixels(image):
+    return not image.is_float and image.depth in PNG_PLANES
+
+def image_png_pixels(image):
+    width, height = image.size
+    channels = image.channels
+    planes = min(PNG_PLANES[image.depth], channels)
+
+    source = pixel_buffer(width * height * channels)
+    image.pixels.foreach_get(source)
+    source = source.reshape(height, width, channels)
+
+    # Blender stores rows bottom-up, PNG wants them top-down
+    pixels = np.empty((height, width, planes), dtype=np.uint8)
+    rows_per_tile = max(1, TILE_PIXELS // width)
+    for y in range(0, height, rows_per_tile):
+        y_end = min(y + rows_per_tile, height)
+        tile = source[height - y_end:height - y, :, :planes][::-1]
+        pixels[y:y_end] = np.clip(tile * 255.0 + 0.5, 0.0, 255.0)
+    return pixels
+
+def image_rgba_pixels(image):
+    # Top-down uint8 RGBA copy of any image, float images are converted to sRGB the way saving them would
+    width, height = image.size
+    channels = image.channels
+    source = pixel_buffer(width * height * channels)
+    image.pixels.foreach_get(source)
+    source = source.reshape(height, width, channels)[::-1]
+
+    rgba = np.ones((height, width, 4), dtype=np.float32)
+    rgba[:, :, :3] = source[:, :, :3] if channels >= 3 else source[:, :, :1]
+    if channels in (2, 4):
+        rgba[:, :, 3] = source[:, :, -1]
+    del source
+    if image.is_float and not image.colorspace_settings.is_data:
+        color = np.clip(rgba[:, :, :3], 0.0, 1.0)
+        rgba[:, :, :3] = np.where(color <= 0.0031308, color * 12.92, 1.055 * np.power(color, 1.0 / 2.4) - 0.055)
+    return np.clip(rgba * 255.0 + 0.5, 0.0, 255.0).astype(np.uint8)
+
+class PrintFiles:
+    # Files of one print are written under a temporary name and only moved over the
+    # real ones once the whole print is done, so a cancelled or failed export never
+    # leaves a half-written print behind.
+    def __init__(self):
+        self.staged = {}
+
+    def stage(self, final_path):
+        folder, filename = os.path.split(final_path)
+        staged_path = os.path.join(folder, staging_name(filename))
+        self.staged[final_path] = staged_path
+        return staged_path
+
+    def commit(self):
+        for final_path, staged_path in self.staged.items():
+            if os.path.exists(staged_path):
+                os.replace(staged_path, final_path)
+        self.staged.clear()
+
+    def rollback(self):
+        for staged_path in self.staged.values():
+            try:
+                os.remove(staged_path)
+            except OSError:
+                pass
+        self.staged.clear()
+
+def staging_prefix(pid=None):
+    return f"{STAGING_PREFIX}{pid or os.getpid()}_"
+
+def staging_name(filename):
+    # Worker processes can write into the same folder (the texture store), each one
+    # stages under its own name so they never write through each other's files
+    return staging_prefix() + filename
+
+def remove_staged_files(export_path, pids):
+    # Files staged by processes that were killed before moving them into place, in the
+    # print folders and the texture store. Returns the names of the folders they were in.
+    prefixes = tuple(staging_prefix(pid) for pid in pids)
+    folders = []
+    try:
+        entries = [entry for entry in os.scandir(export_path) if entry.is_dir()]
+    except OSError:
+        return folders
+    for folder in entries:
+        try:
+            staged = [entry.path for entry in os.scandir(folder.path) if entry.name.startswith(prefixes)]
+        except OSError:
+            continue
+        for path in staged:
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Failed to remove {path}: {e}")
+        if staged:
+            folders.append(folder.name)
+    return sorted(folders)
+
+def staged_path(files, final_path):
+    return files.stage(final_path) if files else final_path
+
+def datablock_bytes(datablock):
+    # Rough size of what removing the datablock gives back
+    if isinstance(datablock, bpy.types.Image):
+        if not datablock.has_data:
+            return 0
+        width, height = datablock.size
+        return width * height * datablock.channels * (4 if datablock.is_float else 1)
+    if isinstance(datablock, bpy.types.Mesh):
+        return len(datablock.vertices) * 12 + len(datablock.loops) * 24 + len(datablock.polygons) * 12
+    return 0
+
+def has_export_name(datablock, names):
+    return any(datablock.name == name or datablock.name.startswith(name + ".") for name in names)
+
+def is_stale_datablock(datablock, names):
+    return datablock.users == 0 and has_export_name(datablock, names)
+
+def is_export_datablock(collection, datablock):
+    # Temporary datablocks the exporter adds to bpy.data itself, tracked or not
+    if export_session and (collection, datablock.name) in export_session.datablocks:
+        return True
+    return has_export_name(datablock, dict(STALE_DATABLOCKS).get(collection, ()))
+
+class ExportSession:
+    # Everything an export adds to bpy.data is tracked here and removed when the
+    # export ends, whether it finished, failed or was cancelled. Images it had to
+    # load to read their pixels are unloaded again.
+    def __init__(self):
+        self.datablocks = []
+        self.loaded_images = {image.name for image in bpy.data.images if image.has_data}
+        self.reclaimed = 0
+
+    def start(self):
+        global export_session
+        export_session = self
+        self.purge_stale()
+
+    def track(self, collection, datablock):
+        self.datablocks.append((collection, datablock.name))
+        return datablock
+
+    def remove(self, collection, datablock):
+        self.reclaimed += datablock_bytes(datablock)
+        getattr(bpy.data, collection).remove(datablock)
+
+    def purge_stale(self):
+        for collection, names in STALE_DATABLOCKS:
+            for datablock in list(getattr(bpy.data, collection)):
+                if is_stale_datablock(datablock, names):
+                    self.remove(collection, datablock)
+
+    def close(self):
+        global export_session
+        # Objects first, their meshes can only go once nothing uses them
+        for collection, name in sorted(self.datablocks, key=lambda entry: entry[0] != "objects"):
+            datablock = getattr(bpy.data, collection).get(name)
+            if datablock is not None:
+                self.remove(collection, datablock)
+        self.datablocks.clear()
+
+        for image in bpy.data.images:
+            if image.has_data and image.name not in self.loaded_images:
+                self.reclaimed += datablock_bytes(image)
+                image.buffers_free()
+
+        export_session = None
+
+def track_datablock(collection, datablock):
+    if export_session:
+        export_session.track(collection, datablock)
+    return datablock
+
+def release_datablock(collection, datablock):
+    if export_session:
+        export_session.remove(collection, datablock)
+    else:
+        getattr(bpy.data, collection).remove(datablock)
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+class TextureWriter:
+    def __init__(self, parallel=False, workers=0, compression=15, store_path=None, texture_budget=0):
+        self.compression = compression
+        self.texture_budget = texture_budget
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ThreadPoolExecutor(max_workers=self.workers) if parallel else None
+        self.store_path = store_path
+        self.stored = {}
+        self.manifests = {}
+        self.pending = []
+        self.failures = []
+        self.settings_indices = {}
+        self.pixel_hashes = {}
+
+    def manifest(self, exportpath):
+        if exportpath not in self.manifests:
+            self.manifests[exportpath] = load_texture_manifest(exportpath)
+        return self.manifests[exportpath]
+
+    def record(self, texture_path, content_hash):
+        self.manifest(os.path.dirname(texture_path))[os.path.basename(texture_path)] = content_hash
+
+    def settings_index(self, material):
+        # Built once per material per export, shared by every print using it
+        index = self.settings_indices.get(material.name)
+        if index is None:
+            index = self.settings_indices[material.name] = {}
+            for setting in material.material_settings:
+                index.setdefault(setting.imageName, []).append(setting)
+        return index
+
+    def content_hash(self, image, *extra):
+        # Pixels are hashed once per image and export, the extras are folded in afterwards
+        pixel_hash = self.pixel_hashes.get(image.name)
+        if pixel_hash is None:
+            pixel_hash = self.pixel_hashes[image.name] = image_content_hash(image)
+        if not extra:
+            return pixel_hash
+        return hashlib.blake2b("|".join((pixel_hash,) + tuple(str(value) for value in extra)).encode(), digest_size=16).hexdigest()
+
+    def is_current(self, texture_path, content_hash):
+        return texture_is_current(self.manifest(os.path.dirname(texture_path)), texture_path, content_hash)
+
+    def has_stored(self, store_key):
+        return bool(self.store_path) and (store_key in self.stored or os.path.exists(os.path.join(self.store_path, f"{store_key}.png")))
+
+    def resized_size(self, image):
+        return imageops.fitted_size(image.size[0], image.size[1], self.texture_budget)
+
+    def encode(self, target_path, image, final_path=None, nearest=False):
+        resize = self.resized_size(image)
+        if resize:
+            resize += (nearest,)
+
+        if can_encode_pixels(image) and (self.executor or resize):
+            # Pixels are pulled out here on the main thread, downscaling and encoding
+            # happen on the workers (or right here without a pool)
+            pixels = image_png_pixels(image)
+            if self.executor:
+                self.throttle()
+                return self.executor.submit(write_png_replacing, target_path, pixels, self.compression, final_path, resize), True
+            try:
+                write_png_replacing(target_path, pixels, self.compression, final_path, resize)
+                return None, True
+            except OSError as e:
+                print(f"Failed to save image {target_path}: {e}")
+                return None, False
+
+        ok = save_resized_image(target_path, image, *resize) if resize else saveImage(target_path, image)
+        if ok and final_path:
+            os.replace(target_path, final_path)
+        return None, ok
+
+    def encode_pixels(self, target_path, pixels, final_path=None, nearest=False):
+        # Textures the exporter puts together itself (atlases), there is no image to save them from
+        resize = imageops.fitted_size(pixels.shape[1], pixels.shape[0], self.texture_budget)
+        if resize:
+            resize += (nearest,)
+        if self.executor:
+            self.throttle()
+            return self.executor.submit(write_png_replacing, target_path, pixels, self.compression, final_path, resize), True
+        try:
+            write_png_replacing(target_path, pixels, self.compression, final_path, resize)
+            return None, True
+        except OSError as e:
+            print(f"Failed to save image {target_path}: {e}")
+            return None, False
+
+    def store(self, image, store_key, nearest=False, pixels=None):
+        # Encodes a texture into the shared store once, later users only link to it
+        if store_key not in self.stored:
+            store_file = os.path.join(self.store_path, f"{store_key}.png")
+            if os.path.exists(store_file):
+                self.stored[store_key] = (None, store_file)
+            else:
+                os.makedirs(self.store_path, exist_ok=True)
+                partial_file = os.path.join(self.store_path, staging_name(f"{store_key}.png"))
+                if pixels is not None:
+                    future, ok = self.encode_pixels(partial_file, pixels, store_file, nearest)
+                else:
+                    future, ok = self.encode(partial_file, image, store_file, nearest)
+                self.stored[store_key] = (future, store_file if ok else None)
+        return self.stored[store_key]
+
+    def save(self, texture_path, image, content_hash, files=None, store_key=None, nearest=False):
+        if self.is_current(texture_path, content_hash):
+            return False
+
+        target_path = staged_path(files, texture_path)
+        if self.store_path:
+            store_key = store_key or self.content_hash(image)
+            if self.texture_budget:
+                store_key = hashlib.blake2b(f"{store_key}|{self.texture_budget}|{nearest}".encode(), digest_size=16).hexdigest()
+            future, store_file = self.store(image, store_key, nearest)
+            if store_file:
+                self.pending.append((future, texture_path, content_hash, store_file, target_path))
+            else:
+                self.failures.append(texture_path)
+            return True
+
+        if not files and os.path.exists(target_path):
+            # Never write through a file that may be hard linked to the store
+            os.remove(target_path)
+        future, ok = self.encode(target_path, image, nearest=nearest)
+        if ok:
+            self.pending.append((future, texture_path, content_hash, None, target_path))
+        else:
+            self.failures.append(texture_path)
+        return True
+
+    def save_pixels(self, texture_path, pixels, content_hash, files=None, nearest=False):
+        # In the shared store the content hash is the key, pixels can be None when has_stored(content_hash)
+        target_path = staged_path(files, texture_path)
+        if self.store_path:
+            future, store_file = self.store(None, content_hash, nearest, pixels)
+            if store_file:
+                self.pending.append((future, texture_path, content_hash, store_file, target_path))
+            else:
+                self.failures.append(texture_path)
+            return
+
+        future, ok = self.encode_pixels(target_path, pixels, nearest=nearest)
+        if ok:
+            self.pending.append((future, texture_path, content_hash, None, target_path))
+        else:
+            self.failures.append(texture_path)
+
+    def throttle(self):
+        # Keep the number of extracted pixel buffers waiting for a worker bounded
+        futures = [entry[0] for entry in self.pending] + [future for future, _ in self.stored.values()]
+        in_flight = [future for future in futures if future and not future.done()]
+        if len(in_flight) >= self.workers * 2:
+            wait(in_flight, return_when=FIRST_COMPLETED)
+
+    def settle(self):
+        written = []
+        for future, texture_path, content_hash, store_file, target_path in self.pending:
+            try:
+                if future:
+                    future.result()
+                if store_file:
+                    link_texture(store_file, target_path)
+                written.append((texture_path, content_hash))
+            except Exception as e:
+                print(f"Failed to save image {texture_path}: {e}")
+                self.failures.append(texture_path)
+        self.pending.clear()
+        return written
+
+    def commit(self):
+        # Waits for every texture saved so far and records them in the manifests
+        for texture_path, content_hash in self.settle():
+            self.record(texture_path, content_hash)
+
+    def discard(self):
+        self.settle()
+
+    def finish(self):
+        self.discard()
+
+        if self.executor:
+            self.executor.shutdown()
+            self.executor = None
+
+        for exportpath, manifest in self.manifests.items():
+            save_texture_manifest(exportpath, manifest)
+        self.manifests.clear()
+        return self.failures
+
+def write_png_replacing(filepath, pixels, compression, final_path=None, resize=None):
+    if resize:
+        pixels = imageops.resize_pixels(pixels, *resize)
+    if os.path.exists(filepath):
+        os.remove(filepath)
+    pngwriter.write_png(filepath, pixels, compression)
+    if final_path:
+        os.replace(filepath, final_path)
+
+def save_resized_image(exportpath, image, width, height, nearest):
+    # Float images keep going through image.save for colour management, from a
+    # temporary downscaled copy so the source image is never touched
+    source_width, source_height = image.size
+    channels = image.channels
+    source = pixel_buffer(source_width * source_height * channels)
+    image.pixels.foreach_get(source)
+
+    resized = imageops.resize_pixels(source.reshape(source_height, source_width, channels), width, height, nearest)
+    del source
+    if channels != 4:
+        rgba = np.ones((height, width, 4), dtype=np.float32)
+        rgba[:, :, :3] = resized[:, :, :1] if channels == 1 else resized[:, :, :3]
+        resized = rgba
+
+    resized_image = track_datablock("images", bpy.data.images.new(RESIZED_IMAGE_NAME, width=width, height=height, alpha=True, float_buffer=image.is_float))
+    try:
+        resized_image.colorspace_settings.name = image.colorspace_settings.name
+        resized_image.pixels.foreach_set(np.ascontiguousarray(resized, dtype=np.float32).ravel())
+        return saveImage(exportpath, resized_image)
+    finally:
+        release_datablock("images", resized_image)
+
+def link_texture(store_file, target_path):
+    if os.path.exists(target_path):
+        os.remove(target_path)
+    try:
+        os.link(store_file, target_path)
+    except OSError:
+        shutil.copyfile(store_file, target_path)
+
+def texture_writer_from_preferences(preferences, export_path=None, texture_budget=0, force_store=False):
+    store_path = os.path.join(export_path, TEXTURE_STORE_NAME) if export_path and (preferences.shared_texture_store or force_store) else None
+    return TextureWriter(preferences.parallel_png, preferences.png_workers, preferences.png_compression, store_path, texture_budget)
+
+def export_material_steps(materials, exportpath, writer, files=None, texture_swaps=None):
+    # texture_swaps maps (material type, material name) to the image a variant uses instead
+    texture_swaps = texture_swaps or {}
+    written = set()
+    skipped_count = 0
+
+    for material in materials:
         if material and material.use_nodes:
             pbrmats = []
             existing_material_types = set()
+            # Emissive maps double as the diffuse map, unless the material has a diffuse map of its own
+            emissive_diffuse = []
             for node in material.node_tree.nodes:
                 if node.type == 'TEX_IMAGE' and node.image:
                     image = node.image
                     imagename = node.label or image.name
                     if image.size[0] > 0 and image.size[1] > 0:
-                        for setting in material.material_settings:
-                            if setting.imageName == imagename:
-                                if setting.materialType.startswith("PBRCALC") and setting.materialType not in existing_material_types:
-                                    pbrmats.append((setting.materialType, image))
-                                    existing_material_types.add(setting.materialType)
-                                else:
-                                    texture_path = os.path.join(exportpath, f"{setting.materialType}_{material.name}.png")
-                                    saveImage(texture_path, image)
-
-                                    if setting.materialType == "emissive":
-                                        diffuse_texture_path = os.path.join(exportpath, f"diffuse_{material.name}.png")
-                                        if not os.path.exists(diffuse_texture_path):
-                                            saveImage(diffuse_texture_path, image)
+                        for setting in writer.settings_index(material).get(imagename, ()):
+                            image = texture_swaps.get((setting.materialType, material.name), node.image)
+                            if setting.materialType.startswith("PBRCALC") and setting.materialType not in existing_material_types:
+                                pbrmats.append((setting.materialType, setting.materialFilter, image))
+                                existing_material_types.add(setting.materialType)
+                            else:
+                                texture_path = os.path.join(exportpath, f"{setting.materialType}_{material.name}.png")
+                                # Every file is written by one job only, two pool workers must never share a destination
+                                if texture_path in written:
+                                    continue
+                                content_hash = writer.content_hash(image, setting.materialType, setting.materialFilter, writer.texture_budget)
+                                nearest = setting.materialFilter == '0'
+                                if not writer.save(texture_path, image, content_hash, files, nearest=nearest):
+                                    skipped_count += 1
+                                written.add(texture_path)
+                                yield texture_path
+
+                                if setting.materialType == "emissive":
+                                    emissive_diffuse.append((image, content_hash, nearest))
+
+            for image, content_hash, nearest in emissive_diffuse:
+                diffuse_texture_path = os.path.join(exportpath, f"diffuse_{material.name}.png")
+                if diffuse_texture_path not in written:
+                    if not writer.save(diffuse_texture_path, image, content_hash, files, nearest=nearest):
+                        skipped_count += 1
+                    written.add(diffuse_texture_path)
+                    yield diffuse_texture_path
 
             if pbrmats:
-                metallic_img = next((img for mat_type, img in pbrmats if mat_type == "PBR_metallic"), None)
-                roughness_img = next((img for mat_type, img in pbrmats if mat_type == "PBR_roughness"), None)
-                subsurface_weight_img = next((img for mat_type, img in pbrmats if mat_type == "PBR_specular"), None)
-
-                pbrimage = combine_channels(metallic_img, roughness_img, subsurface_weight_img)
-                saveImage(os.path.join(exportpath, f"pbr_{material.name}.png"), pbrimage)
-
-def selectAll(objects, select, type = {'MESH', 'CURVE', 'SURFACE', 'FONT', 'META'}, selectUCX = False):
-    bpy.ops.object.select_all(action='DESELECT')
+                metallic_img = next((img for mat_type, _, img in pbrmats if mat_type == "PBRCALC_metalic"), None)
+                roughness_img = next((img for mat_type, _, img in pbrmats if mat_type == "PBRCALC_roughness"), None)
+                subsurface_weight_img = next((img for mat_type, _, img in pbrmats if mat_type == "PBRCALC_specular"), None)
+
+                # Hash the sources so an unchanged pbr map isn't even packed
+                content_hash = hashlib.blake2b(digest_size=16)
+                for mat_type, mat_filter, img in sorted(pbrmats, key=lambda entry: entry[0]):
+                    content_hash.update(writer.content_hash(img, mat_type, mat_filter).encode())
+                content_hash.update(f"{writer.texture_budget}".encode())
+                content_hash = content_hash.hexdigest()
+                nearest = any(mat_filter == '0' for _, mat_filter, _ in pbrmats)
+
+                pbr_path = os.path.join(exportpath, f"pbr_{material.name}.png")
+                if pbr_path in written:
+                    continue
+                written.add(pbr_path)
+                if writer.is_current(pbr_path, content_hash):
+                    skipped_count += 1
+                    continue
+
+                # Already in the shared store, no need to pack it again
+                if writer.has_stored(content_hash):
+                    writer.save(pbr_path, None, content_hash, files, store_key=content_hash, nearest=nearest)
+                else:
+                    pbrimage = combine_channels(metallic_img, roughness_img, subsurface_weight_img)
+                    if pbrimage:
+                        writer.save(pbr_path, pbrimage, content_hash, files, store_key=content_hash, nearest=nearest)
+                yield pbr_path
+
+    return skipped_count
+
+def atlas_sources(material, writer):
+    # Texture type -> image of one material, the PBRCALC maps as a (metallic, roughness, specular) tuple
+    sources = {}
+    pbr_channels = {}
+    for node in material.node_tree.nodes:
+        if node.type == 'TEX_IMAGE' and node.image and node.image.size[0] > 0 and node.image.size[1] > 0:
+            for setting in writer.settings_index(material).get(node.label or node.image.name, ()):
+                if setting.materialType.startswith("PBRCALC"):
+                    pbr_channels.setdefault(setting.materialType, node.image)
+                else:
+                    sources.setdefault(setting.materialType, node.image)
+
+    # Same fallbacks as export_material_steps
+    if "diffuse" not in sources and "emissive" in sources:
+        sources["diffuse"] = sources["emissive"]
+    if "pbr" not in sources and pbr_channels:
+        sources["pbr"] = (pbr_channels.get("PBRCALC_metalic"), pbr_channels.get("PBRCALC_roughness"), pbr_channels.get("PBRCALC_specular"))
+    return sources
+
+def source_images(source):
+    return [img for img in source if img] if isinstance(source, tuple) else [source]
+
+def atlas_tile_size(sources):
+    images = source_images(sources.get("diffuse") or next(iter(sources.values())))
+    return max(img.size[0] for img in images), max(img.size[1] for img in images)
+
+def fit_tile(pixels, width, height, nearest):
+    source_height, source_width = pixels.shape[:2]
+    if (source_width, source_height) == (width, height):
+        return pixels
+    if source_width >= width and source_height >= height:
+        return imageops.resize_pixels(pixels, width, height, nearest)
+    # Smaller maps are blown up to the tile by repeating pixels
+    return imageops.nearest_downscale(pixels, width, height)
+
+class PrintAtlas:
+    # Materials of one print sharing a filter, packed into a single material with one texture per type
+    def __init__(self, name, material_filter, materials, writer):
+        self.name = name
+        self.filter = material_filter
+        self.padding = atlas.PADDING[material_filter]
+        self.sources = {material.name: atlas_sources(material, writer) for material in materials}
+        self.types = [texture_type for texture_type in ATLAS_TYPES if any(texture_type in sources for sources in self.sources.values())]
+
+        # Packed at the budgeted resolution so the gutters keep their width in the written texture
+        max_size = min(writer.texture_budget or atlas.MAX_SIZE, atlas.MAX_SIZE)
+        source_sizes = [atlas_tile_size(sources) for sources in self.sources.values()]
+        positions, cells, self.size = atlas.pack_tiles(source_sizes, self.padding, max_size)
+        self.positions = dict(zip(self.sources, positions))
+        # Size of each tile's content, inside its gutter
+        self.sizes = {name: atlas.content_size(cell, self.padding) for name, cell in zip(self.sources, cells)}
+        self.transforms = {name: atlas.tile_uv_transform(self.positions[name], self.sizes[name], self.size, self.padding) for name in self.sizes}
+
+    def content_hash(self, texture_type, writer):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{texture_type}|{self.filter}|{self.size}|{writer.texture_budget}".encode())
+        for name, sources in self.sources.items():
+            source = sources.get(texture_type)
+            hashes = [writer.content_hash(img) for img in source_images(source)] if source else []
+            digest.update(f"|{name}|{self.positions[name]}|{self.sizes[name]}|{'|'.join(hashes)}".encode())
+        return digest.hexdigest()
+
+    def pixels(self, texture_type):
+        width, height = self.size
+        result = np.empty((height, width, 4), dtype=np.uint8)
+        result[:] = ATLAS_FILL[texture_type]
+        for name, sources in self.sources.items():
+            tile_width, tile_height = self.sizes[name]
+            source = sources.get(texture_type)
+            if source is None:
+                tile = np.empty((tile_height, tile_width, 4), dtype=np.uint8)
+                tile[:] = ATLAS_FILL[texture_type]
+            else:
+                image = combine_channels(*source) if isinstance(source, tuple) else source
+                tile = fit_tile(image_rgba_pixels(image), tile_width, tile_height, self.filter == '0')
+            atlas.place_tile(result, tile, self.positions[name], self.padding)
+        return result
+
+def material_uvs_in_unit_square(obj, depsgraph):
+    # Material name -> whether every UV of its faces stays inside 0-1 (no tiling)
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = obj_eval.to_mesh()
+    found = {}
+    try:
+        if mesh is None or not mesh.uv_layers.active:
+            return found
+        uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        mesh.uv_layers.active.data.foreach_get("uv", uvs)
+        face_materials = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("material_index", face_materials)
+        face_sizes = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", face_sizes)
+    finally:
+        obj_eval.to_mesh_clear()
+
+    uvs = uvs.reshape(-1, 2)
+    loop_slots = np.repeat(face_materials, face_sizes)
+    names = [slot.material.name if slot.material else None for slot in obj_eval.material_slots]
+    for slot in np.unique(face_materials):
+        if 0 <= slot < len(names) and names[slot]:
+            found[names[slot]] = found.get(names[slot], True) and atlas.uvs_in_unit_square(uvs[loop_slots == slot])
+    return found
+
+def atlas_filter(material):
+    settings = list(material.material_settings)
+    diffuse = next((setting for setting in settings if setting.materialType == "diffuse"), settings[0])
+    return diffuse.materialFilter
+
+def print_atlases(name, objects, depsgraph, writer, excluded=()):
+    # Material name -> the PrintAtlas it is packed into. Materials with tiling UVs keep their own textures.
+    packable = {}
+    for obj in objects:
+        for material_name, inside in material_uvs_in_unit_square(obj, depsgraph).items():
+            packable[material_name] = packable.get(material_name, True) and inside
+
+    groups = {}
+    for material_name, inside in packable.items():
+        material = bpy.data.materials.get(material_name)
+        if inside and material_name not in excluded and material and material.use_nodes and len(material.material_settings) and atlas_sources(material, writer):
+            groups.setdefault(atlas_filter(material), []).append(material)
+    groups = {material_filter: materials for material_filter, materials in groups.items() if len(materials) > 1}
+
+    atlases = {}
+    for material_filter, materials in groups.items():
+        atlas_name = f"{name}_atlas" if len(groups) == 1 else f"{name}_atlas_{'nearest' if material_filter == '0' else 'bilinear'}"
+        print_atlas = PrintAtlas(atlas_name, material_filter, materials, writer)
+        atlases.update(dict.fromkeys((material.name for material in materials), print_atlas))
+    return atlases
+
+def apply_print_atlases(mesh, atlases):
+    transforms = {}
+    for slot, material_name in enumerate(mesh.material_names):
+        print_atlas = atlases.get(material_name)
+        if print_atlas:
+            transforms[slot] = print_atlas.transforms[material_name]
+            mesh.material_names[slot] = print_atlas.name
+    if transforms and mesh.uvs is not None:
+        mesh.uvs = atlas.remap_uvs(mesh.uvs, np.repeat(mesh.face_materials, mesh.face_sizes), transforms)
+
+def export_atlas_steps(atlases, exportpath, writer, files=None):
+    skipped_count = 0
+    for print_atlas in dict.fromkeys(atlases.values()):
+        for texture_type in print_atlas.types:
+            texture_path = os.path.join(exportpath, f"{texture_type}_{print_atlas.name}.png")
+            content_hash = print_atlas.content_hash(texture_type, writer)
+            if writer.is_current(texture_path, content_hash):
+                skipped_count += 1
+            elif writer.has_stored(content_hash):
+                # Already in the shared store (another variant of the print), no need to build it again
+                writer.save_pixels(texture_path, None, content_hash, files, nearest=print_atlas.filter == '0')
+            else:
+                writer.save_pixels(texture_path, print_atlas.pixels(texture_type), content_hash, files, nearest=print_atlas.filter == '0')
+            yield texture_path
+    return skipped_count
+
+def exportOBJMaterials(materials, exportpath, writer=None):
+    owns_writer = writer is None
+    if owns_writer:
+        writer = TextureWriter()
+
+    skipped_count = run_steps(export_material_steps(materials, exportpath, writer))
+
+    if owns_writer:
+        writer.commit()
+        writer.finish()
+    return skipped_count
+
+def world_extents(objects):
+    objects = [obj for obj in objects if obj.type in PRINTABLE_TYPES]
+    if not objects:
+        return np.empty((0, 2, 3))
+
+    # All 8 bound_box corners of every object transformed in one batch
+    corners = np.array([obj.bound_box for obj in objects], dtype=np.float64)
+    matrices = np.array([obj.matrix_world for obj in objects], dtype=np.float64)
+    world = np.einsum('nij,nkj->nki', matrices[:, :3, :3], corners) + matrices[:, np.newaxis, :3, 3]
+    return np.stack((world.min(axis=1), world.max(axis=1)), axis=1)
+
+def evaluated_world_extents(objects, depsgraph):
+    # Extents of the evaluated vertices, the bound_box corners of a rotated object overshoot
+    extents = []
     for obj in objects:
-        if obj.type not in type:
+        if obj.type not in PRINTABLE_TYPES:
             continue
-        if not selectUCX and obj.name.startswith("UCX_"):
+        obj_eval = obj.evaluated_get(depsgraph)
+        mesh = obj_eval.to_mesh()
+        if mesh is None:
             continue
-        obj.select_set(select)
+        try:
+            positions = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+            mesh.vertices.foreach_get("co", positions)
+        finally:
+            obj_eval.to_mesh_clear()
+        if len(positions) == 0:
+            continue
+
+        matrix = np.array(obj_eval.matrix_world, dtype=np.float64)
+        world = positions.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+        extents.append((world.min(axis=0), world.max(axis=0)))
+    return np.array(extents, dtype=np.float64).reshape(-1, 2, 3)
+
+def dimensions_from_extents(extents):
+    if len(extents) == 0:
+        return (0.0, 0.0, 0.0)
+    return tuple(float(d) for d in extents[:, 1].max(axis=0) - extents[:, 0].min(axis=0))
 
 def calculate_overall_bounding_box(selected_objects):
     if not selected_objects:
         return None
 
-    min_bound = mathutils.Vector((float('inf'), float('inf'), float('inf')))
-    max_bound = mathutils.Vector((float('-inf'), float('-inf'), float('-inf')))
-
-    for obj in selected_objects:
-        if obj.type in {'MESH', 'CURVE', 'SURFACE', 'FONT', 'META'}:
-            bbox_corners = [obj.matrix_world @ mathutils.Vector(corner) for corner in obj.bound_box]
-            for corner in bbox_corners:
-                min_bound.x = min(min_bound.x, corner.x)
-                min_bound.y = min(min_bound.y, corner.y)
-                min_bound.z = min(min_bound.z, corner.z)
-                max_bound.x = max(max_bound.x, corner.x)
-                max_bound.y = max(max_bound.y, corner.y)
-                max_bound.z = max(max_bound.z, corner.z)
-
-    overall_dimensions = (max_bound.x - min_bound.x, max_bound.y - min_bound.y, max_bound.z - min_bound.z)
-    return overall_dimensions
+    return dimensions_from_extents(world_extents(selected_objects))
 
 def getSizeLimit(limitIdentifier):
     return [100.00, 100.00, 150.00] if limitIdentifier == "FULLSIZE" else [22.50, 22.50, 30.00]
 
-def exportOBJ(self, file_path, exportSelected):
+def getTextureBudget(properties):
+    if properties.texture_budget == 'PRINTER':
+        return 2048 if properties.sizelimit == "FULLSIZE" else 1024
+    if properties.texture_budget == 'CUSTOM':
+        return properties.texture_budget_size
+    return 0
+
+def evaluated_mesh_arrays(obj, depsgraph, with_triangles=False):
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = obj_eval.to_mesh()
+    if mesh is None:
+        return None
+
     try:
-        export_func = bpy.ops.wm.obj_export if bpy.app.version >= (4, 0, 0) else bpy.ops.export_scene.obj
-        export_func(filepath=file_path, export_selected_objects=exportSelected)
-    except:
+        if len(mesh.polygons) == 0:
+            return None
+
+        # foreach_get fills flat float32/int32 buffers without going through Python objects
+        positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", positions)
+        loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_vertices)
+        face_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_start", face_starts)
+        face_sizes = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", face_sizes)
+        face_materials = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("material_index", face_materials)
+
+        uvs = None
+        if mesh.uv_layers.active:
+            uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+            mesh.uv_layers.active.data.foreach_get("uv", uvs)
+            uvs = uvs.reshape(-1, 2).astype(np.float64)
+
+        normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+        mesh.corner_normals.foreach_get("vector", normals)
+
+        triangle_loops = None
+        if with_triangles:
+            mesh.calc_loop_triangles()
+            triangle_loops = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+            mesh.loop_triangles.foreach_get("loops", triangle_loops)
+
+        material_names = [slot.material.name if slot.material else None for slot in obj_eval.material_slots]
+    finally:
+        obj_eval.to_mesh_clear()
+
+    # Bake matrix_world and Blender's Z-up into the OBJ's Y-up in one matrix
+    matrix = OBJ_AXIS_CONVERSION @ np.array(obj_eval.matrix_world, dtype=np.float64)
+    positions = positions.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+
+    normals = normals.reshape(-1, 3) @ np.linalg.inv(matrix[:3, :3])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+
+    arrays = objwriter.MeshArrays(obj.name, positions, loop_vertices, face_starts, face_sizes,
+                                  face_materials, material_names, uvs, normals, triangle_loops)
+    if np.linalg.det(matrix[:3, :3]) < 0:
+        arrays.reverse_winding()
+    return arrays
+
+def mesh_triangle_count(mesh):
+    face_sizes = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", face_sizes)
+    return int((face_sizes - 2).sum())
+
+def evaluated_triangle_count(obj, depsgraph):
+    obj_eval = obj.evaluated_get(depsgraph)
+    if obj_eval.type == 'MESH':
+        return mesh_triangle_count(obj_eval.data)
+
+    mesh = obj_eval.to_mesh()
+    try:
+        return mesh_triangle_count(mesh) if mesh else 0
+    finally:
+        obj_eval.to_mesh_clear()
+
+def decimated_mesh_arrays(obj, depsgraph, ratio, with_triangles=False):
+    # The Decimate modifier runs on a temporary copy of the evaluated mesh, the
+    # scene's object is never modified
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = bpy.data.meshes.new_from_object(obj_eval)
+    mesh.name = DECIMATE_OBJECT_NAME
+    track_datablock("meshes", mesh)
+    decimated = track_datablock("objects", bpy.data.objects.new(DECIMATE_OBJECT_NAME, mesh))
+    decimated.matrix_world = obj_eval.matrix_world
+    bpy.context.scene.collection.objects.link(decimated)
+
+    try:
+        modifier = decimated.modifiers.new("Decimate", 'DECIMATE')
+        modifier.decimate_type = 'COLLAPSE'
+        modifier.ratio = ratio
+        modifier.use_collapse_triangulate = True
+        depsgraph.update()
+
+        arrays = evaluated_mesh_arrays(decimated, depsgraph, with_triangles)
+        if arrays:
+            arrays.name = obj.name
+            arrays.material_names = [slot.material.name if slot.material else None for slot in obj_eval.material_slots]
+        return arrays
+    finally:
+        release_datablock("objects", decimated)
+        release_datablock("meshes", mesh)
+
+def hull_builder_from_properties(properties):
+    if properties.collision_hulls == 'NONE':
+        return None
+    max_hulls = properties.collision_hull_count if properties.collision_hulls == 'PARTS' else 1
+    return hull.HullBuilder(properties.collision_hull_vertices, max_hulls)
+
+def hull_mesh_arrays(name, vertices, triangles):
+    return objwriter.MeshArrays(name, vertices, triangles.ravel(), np.arange(len(triangles)) * 3, np.full(len(triangles), 3))
+
+def export_obj_steps(self, file_path, name, objects, collisions, depsgraph, files=None, triangle_budget=0, stats=None, hull_builder=None, atlases=None,
+                     optimize_vertex_cache=False, precision=None, mtl_path=None):
+    mtl_path = mtl_path or os.path.splitext(file_path)[0] + ".mtl"
+    material_names = {}
+    stats = stats if stats is not None else {}
+
+    triangle_counts = [evaluated_triangle_count(obj, depsgraph) for obj in objects]
+    stats["triangles_before"] = sum(triangle_counts)
+    stats["triangles_after"] = 0
+    cache_misses = [0, 0]
+    ratio = triangle_budget / stats["triangles_before"] if triangle_budget and stats["triangles_before"] > triangle_budget else 1.0
+
+    try:
+        if os.path.exists(file_path):
+            stats["obj_bytes_before"] = os.path.getsize(file_path)
+        with objwriter.OBJWriter(staged_path(files, file_path), os.path.basename(mtl_path), precision) as writer:
+            writer.begin_object(name)
+            for obj, triangle_count in zip(objects, triangle_counts):
+                # Every object gives up the same share of its triangles to fit the print's budget
+                if ratio < 1.0 and triangle_count > 0:
+                    mesh = decimated_mesh_arrays(obj, depsgraph, ratio, optimize_vertex_cache)
+                else:
+                    mesh = evaluated_mesh_arrays(obj, depsgraph, optimize_vertex_cache)
+                if mesh:
+                    if atlases:
+                        apply_print_atlases(mesh, atlases)
+                    if optimize_vertex_cache:
+                        misses_before, misses_after = vertexcache.optimize_mesh(mesh)
+                        cache_misses[0] += misses_before
+                        cache_misses[1] += misses_after
+                    writer.write_mesh(mesh)
+                    stats["triangles_after"] += mesh.triangle_count
+                    if hull_builder:
+                        hull_builder.add_mesh(mesh.positions, mesh.loop_vertices, mesh.face_starts, mesh.face_sizes)
+                    material_names.update(dict.fromkeys(n for n in mesh.material_names if n))
+                yield obj.name
+
+            for collision in collisions:
+                mesh = evaluated_mesh_arrays(collision, depsgraph)
+                if mesh:
+                    writer.begin_object(collision.name)
+                    writer.write_mesh(mesh, use_materials=False)
+                yield collision.name
+
+            if optimize_vertex_cache and stats["triangles_after"]:
+                stats["acmr_before"] = round(cache_misses[0] / stats["triangles_after"], 3)
+                stats["acmr_after"] = round(cache_misses[1] / stats["triangles_after"], 3)
+
+            if hull_builder:
+                hulls = hull_builder.hulls()
+                for index, (vertices, triangles) in enumerate(hulls):
+                    hull_name = f"UCX_{name}" if len(hulls) == 1 else f"UCX_{name}_{index:02d}"
+                    writer.begin_object(hull_name)
+                    writer.write_mesh(hull_mesh_arrays(hull_name, vertices, triangles), use_materials=False)
+                stats["generated_collisions"] = len(hulls)
+
+        stats["obj_bytes"] = writer.bytes_written
+        objwriter.write_mtl(staged_path(files, mtl_path), material_names)
+    except OSError:
         self.report({'ERROR'}, "Export path does not exist.")
-        return {"CANCELLED"}
+        return None
+
+    return [bpy.data.materials[n] for n in material_names if n in bpy.data.materials]
+
+def exportOBJ(self, file_path, name, objects, collisions, depsgraph):
+    return run_steps(export_obj_steps(self, file_path, name, objects, collisions, depsgraph))
 
 def create_folder(self, folder_path):
     try:
@@ -106,50 +1105,342 @@ def create_folder(self, folder_path):
     except Exception:
         self.report({'ERROR'}, "Could not create folder.")
 
-def save_properties_file(export_path, properties):
-    properties_file_path = os.path.join(export_path, "properties.cfg")
+def save_properties_file(export_path, properties, materials, files=None, atlases=None):
+    properties_file_path = staged_path(files, os.path.join(export_path, "properties.cfg"))
     with open(properties_file_path, 'w') as f:
-        for obj in bpy.context.selected_objects:
-            if obj.type == 'MESH':
-                for mat_slot in obj.material_slots:
-                    if mat_slot.material:
-                        for setting in mat_slot.material.material_settings:
-                            f.write(f"filter_{setting.materialType}_{mat_slot.material.name}={setting.materialFilter}\n")
+        for material in materials:
+            for setting in material.material_settings:
+                f.write(f"filter_{setting.materialType}_{material.name}={setting.materialFilter}\n")
+        for print_atlas in dict.fromkeys((atlases or {}).values()):
+            for texture_type in print_atlas.types:
+                f.write(f"filter_{texture_type}_{print_atlas.name}={print_atlas.filter}\n")
         for key, value in properties.items():
             if value is not None:
                 f.write(f"{key}={value}\n")
 
+def hash_mesh_attribute(digest, collection, attribute, dtype, width=1):
+    values = np.empty(len(collection) * width, dtype=dtype)
+    collection.foreach_get(attribute, values)
+    digest.update(values.tobytes())
+
+def hash_evaluated_object(digest, obj, depsgraph):
+    # Everything evaluated_mesh_arrays reads, so any change that reaches the OBJ changes the hash
+    obj_eval = obj.evaluated_get(depsgraph)
+    digest.update(f"|{obj.name}|{obj_eval.type}|".encode())
+    digest.update(np.array(obj_eval.matrix_world, dtype=np.float32).tobytes())
+    material_names = [slot.material.name if slot.material else "" for slot in obj_eval.material_slots]
+    digest.update("|".join(material_names).encode())
+
+    mesh = obj_eval.data if obj_eval.type == 'MESH' else obj_eval.to_mesh()
+    try:
+        if mesh is None:
+            return material_names
+        hash_mesh_attribute(digest, mesh.vertices, "co", np.float32, 3)
+        hash_mesh_attribute(digest, mesh.loops, "vertex_index", np.int32)
+        hash_mesh_attribute(digest, mesh.polygons, "loop_start", np.int32)
+        hash_mesh_attribute(digest, mesh.polygons, "material_index", np.int32)
+        if mesh.uv_layers.active:
+            hash_mesh_attribute(digest, mesh.uv_layers.active.data, "uv", np.float32, 2)
+        hash_mesh_attribute(digest, mesh.corner_normals, "vector", np.float32, 3)
+    finally:
+        if obj_eval.type != 'MESH':
+            obj_eval.to_mesh_clear()
+    return material_names
+
+def geometry_fingerprint(objects, collisions, depsgraph, writer):
+    # Meshes, collision and materials of a print, shared by all of its variants
+    digest = hashlib.blake2b(digest_size=16)
+    material_names = {}
+    for obj in objects:
+        material_names.update(dict.fromkeys(n for n in hash_evaluated_object(digest, obj, depsgraph) if n))
+    digest.update(b"|collisions")
+    for collision in collisions:
+        hash_evaluated_object(digest, collision, depsgraph)
+
+    for name in material_names:
+        material = bpy.data.materials.get(name)
+        if material is None or "material_settings" not in material:
+            continue
+        for setting in material.material_settings:
+            image_hash = writer.content_hash(setting.image) if setting.image else ""
+            digest.update(f"|{name}|{setting.imageName}|{setting.materialType}|{setting.materialFilter}|{image_hash}".encode())
+    return digest.hexdigest()
+
+def print_fingerprint(geometry, properties, properties_file, writer, texture_swaps=None):
+    settings = {key: getattr(properties, key) for key in FINGERPRINT_SETTINGS}
+    settings.update(version=FINGERPRINT_VERSION, geometry=geometry, texture_budget=writer.texture_budget, properties_file=properties_file,
+                    texture_swaps=sorted(f"{texture_type}|{material}|{writer.content_hash(image)}" for (texture_type, material), image in (texture_swaps or {}).items()))
+    return hashlib.blake2b(json.dumps(settings, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+def print_is_current(export_folder, object_file_path, mtl_path, fingerprint):
+    try:
+        with open(os.path.join(export_folder, PRINT_MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if manifest.get("fingerprint") != fingerprint:
+        return False
+
+    # The print's files must all still be there
+    expected = [object_file_path, mtl_path, os.path.join(export_folder, "properties.cfg")]
+    expected += [os.path.join(export_folder, texture) for texture in load_texture_manifest(export_folder)]
+    return all(os.path.exists(path) for path in expected)
+
+def save_print_manifest(export_folder, fingerprint, files=None):
+    with open(staged_path(files, os.path.join(export_folder, PRINT_MANIFEST_NAME)), 'w') as f:
+        json.dump({"fingerprint": fingerprint}, f)
+
+def pixel_buffer(length):
+    # Full size float32 copies of images are never kept around: each one is
+    # dropped by its caller once used, so at most a couple are alive at a time
+    return np.empty(length, dtype=np.float32)
+
+def scratch_image(width, height):
+    image = bpy.data.images.get(SCRATCH_IMAGE_NAME)
+    if image is None:
+        image = track_datablock("images", bpy.data.images.new(SCRATCH_IMAGE_NAME, width=width, height=height))
+    elif tuple(image.size) != (width, height):
+        image.scale(width, height)
+    return image
+
+def pack_channel(combined, image, source_channel, target_channel, scale=1.0):
+    height, width = combined.shape[:2]
+    source_width, source_height = image.size
+
+    channels = image.channels
+    source = pixel_buffer(source_width * source_height * channels)
+    image.pixels.foreach_get(source)
+    source = source.reshape(source_height, source_width, channels)
+    source_channel = min(source_channel, channels - 1)
+
+    # Nearest sampling when the map doesn't match the packed resolution
+    resample = (source_width, source_height) != (width, height)
+    columns = np.arange(width) * source_width // width
+    rows_per_tile = max(1, TILE_PIXELS // width)
+
+    for y in range(0, height, rows_per_tile):
+        y_end = min(y + rows_per_tile, height)
+        if resample:
+            rows = np.arange(y, y_end) * source_height // height
+            tile = source[rows[:, np.newaxis], columns, source_channel]
+        else:
+            tile = source[y:y_end, :, source_channel]
+        np.multiply(tile, scale, out=combined[y:y_end, :, target_channel])
+
 def combine_channels(metallic_img=None, roughness_img=None, specular_img=None):
-    if metallic_img:
-        width, height = metallic_img.size
-    elif roughness_img:
-        width, height = roughness_img.size
-    elif specular_img:
-        width, height = specular_img.size
-    else:
-        return {"CANCELLED"}
+    images = [img for img in (metallic_img, roughness_img, specular_img) if img]
+    if not images:
+        return None
 
-    combined_img = bpy.data.images.new('CombinedImage', width=width, height=height)
-    metallic_pixels = np.array(metallic_img.pixels[:]) if metallic_img else np.zeros((width * height * 4,), dtype=np.float32)
-    roughness_pixels = np.array(roughness_img.pixels[:]) if roughness_img else np.zeros((width * height * 4,), dtype=np.float32)
-    subsurface_weight_pixels = np.array(specular_img.pixels[:]) if specular_img else np.zeros((width * height * 4,), dtype=np.float32)
+    width = max(img.size[0] for img in images)
+    height = max(img.size[1] for img in images)
 
-    combined_pixels = np.zeros((width * height * 4,), dtype=np.float32)
-    combined_pixels[0::4] = metallic_pixels[0::4]  # Red channel
-    combined_pixels[1::4] = -subsurface_weight_pixels[1::4]  # Green channel
-    combined_pixels[2::4] = roughness_pixels[2::4]  # Blue channel
-    combined_pixels[3::4] = 1.0  # Alpha channel (fully opaque)
+    combined = pixel_buffer(width * height * 4)
+    combined_view = combined.reshape(height, width, 4)
 
-    combined_img.pixels = combined_pixels.tolist()
+    for img, channel, scale in ((metallic_img, 0, 1.0), (specular_img, 1, -1.0), (roughness_img, 2, 1.0)):
+        if img:
+            pack_channel(combined_view, img, channel, channel, scale)
+        else:
+            combined_view[:, :, channel] = 0.0
+    combined_view[:, :, 3] = 1.0  # Alpha channel (fully opaque)
+
+    combined_img = scratch_image(width, height)
+    combined_img.pixels.foreach_set(combined)
     return combined_img
 
-def sizeCheck():
+def build_properties_file(properties, overrides=None):
+    overrides = overrides or {}
+    def value(key):
+        return overrides[key] if key in overrides else getattr(properties, key)
+
+    lamp_color = value("lamp_color")
+    lamp_offset = value("lamp_offset")
+    return {
+        "physical_material": value("physical_material"),
+        "emissive_strength": round(value("emissive_strength"), 3),
+        "is_lamp": int(value("lamp")),
+        "lamp_color": f"(R={round(lamp_color[0], 3)},G={round(lamp_color[1], 3)},B={round(lamp_color[2], 3)})",
+        "lamp_offset": f"(X={round(lamp_offset[0], 3)},Y={round(-lamp_offset[1], 3)},Z={round(lamp_offset[2], 3)})",
+        "lamp_intensity": round(value("lamp_intensity"), 3),
+        "lamp_attenuation": round(value("lamp_attenuation"), 3),
+        "lamp_shadows": int(value("lamp_shadows")),
+        "health": round(value("health"), 3),
+        "impact_resistance": round(value("impact_resistance"), 3),
+        "damage_resistance": round(value("damage_resistance"), 3),
+        "light_toggle": int(value("lamp_toggle"))
+    }
+
+class PrintVariant:
+    # One row of the variant table: property overrides and texture swaps.
+    # texture_swaps maps (material type, material name) to an image name or file.
+    def __init__(self, name, overrides, texture_swaps):
+        self.name = name
+        self.overrides = overrides
+        self.texture_swaps = texture_swaps
+
+def load_variant_table(path, properties):
+    # CSV with a "name" column, one column per overridden print property and
+    # "texture:<type>:<material>" columns for swapped textures. Empty cells keep the print's value.
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    if rows and "name" not in rows[0]:
+        raise ValueError("The variant table needs a 'name' column")
+
+    variants = []
+    for line, row in enumerate(rows, start=2):
+        name = (row.pop("name") or "").strip()
+        if not name:
+            continue
+        overrides = {}
+        texture_swaps = {}
+        for column, text in row.items():
+            if not column or not text or not text.strip():
+                continue
+            column = column.strip()
+            if column.startswith("texture:"):
+                _, texture_type, material_name = column.split(":", 2)
+                texture_swaps[(texture_type, material_name)] = text.strip()
+                continue
+            if column not in PROPERTIES_FILE_FIELDS:
+                raise ValueError(f"Line {line}: '{column}' is not a print property a variant can change")
+            key, value = parse_override(properties, f"{column}={text}")
+            # Vectors (lamp_color, lamp_offset) need every component, the properties file reads them all
+            size = properties.bl_rna.properties[key].array_length
+            if size and len(value) != size:
+                raise ValueError(f"Line {line}: '{column}' needs {size} comma separated values, got {len(value)}")
+            overrides[key] = value
+        variants.append(PrintVariant(name, overrides, texture_swaps))
+    return variants
+
+def resolve_texture_swaps(variants, table_path):
+    # Swapped textures name an image of the .blend or a file next to the table
+    folder = os.path.dirname(table_path)
+    for variant in variants:
+        for key, source in variant.texture_swaps.items():
+            image = bpy.data.images.get(source)
+            if image is None:
+                path = source if os.path.isabs(source) else os.path.join(folder, source)
+                known = {img.name for img in bpy.data.images}
+                image = bpy.data.images.load(path, check_existing=True)
+                if image.name not in known:
+                    track_datablock("images", image)
+            variant.texture_swaps[key] = image
+
+class CollisionIndex:
+    # UCX_ meshes of the view layer keyed by the text after "UCX_". A print named N
+    # gets every collision whose suffix is a substring of N, the same rule the
+    # exporter always used, found by looking up N's substrings instead of
+    # rescanning scene.objects for every print.
+    def __init__(self, scene, view_layer):
+        view_layer_names = {obj.name for obj in view_layer.objects}
+        self.collisions = [obj for obj in scene.objects if obj.type == 'MESH' and obj.name.startswith("UCX_") and obj.name in view_layer_names]
+        self.order = {obj.name: index for index, obj in enumerate(self.collisions)}
+        self.by_suffix = {}
+        for collision in self.collisions:
+            self.by_suffix.setdefault(collision.name[4:], []).append(collision)
+        self.longest_suffix = max((len(suffix) for suffix in self.by_suffix), default=-1)
+
+    def match(self, name):
+        found = []
+        for length in range(min(len(name), self.longest_suffix) + 1):
+            for suffix in {name[start:start + length] for start in range(len(name) - length + 1)}:
+                found.extend(self.by_suffix.get(suffix, ()))
+        return sorted(found, key=lambda obj: self.order[obj.name])
+
+def estimated_print_steps(objects, collisions):
+    materials = {slot.material for obj in objects for slot in obj.material_slots if slot.material}
+    return len(objects) + len(collisions) + sum(len(material.material_settings) for material in materials)
+
+def rna_settings(owner, skip=()):
+    # Plain property values of a property group or the preferences, JSON friendly
+    settings = {}
+    for prop in owner.bl_rna.properties:
+        if prop.identifier == "rna_type" or prop.identifier in skip or prop.is_readonly or prop.type in {'POINTER', 'COLLECTION'}:
+            continue
+        value = getattr(owner, prop.identifier)
+        settings[prop.identifier] = tuple(value) if getattr(prop, "is_array", False) else value
+    return settings
+
+def unsaved_images(prints):
+    # Painted but unsaved images would be read from disk by the workers
+    names = set()
+    for _, objects, _ in prints:
+        for obj in objects:
+            for slot in obj.material_slots:
+                if slot.material and slot.material.use_nodes:
+                    names.update(node.image.name for node in slot.material.node_tree.nodes
+                                 if node.type == 'TEX_IMAGE' and node.image and node.image.is_dirty)
+    return names
+
+def write_print_snapshot(path, prints, properties, extra_datablocks=()):
+    # A scene holding only the prints' objects and collision, written with everything
+    # they use (meshes, modifiers' objects, materials, images). The open file is left as it is.
+    scene = bpy.data.scenes.new(SNAPSHOT_SCENE_NAME)
+    try:
+        for key, value in rna_settings(properties, skip={"watch_mode"}).items():
+            setattr(scene.votv_properties, key, value)
+        # Relative paths would be relative to the snapshot
+        scene.votv_properties.variant_table = bpy.path.abspath(properties.variant_table)
+        for obj in {obj for _, objects, collisions in prints for obj in objects + collisions}:
+            scene.collection.objects.link(obj)
+        bpy.data.libraries.write(path, {scene, *extra_datablocks}, path_remap='ABSOLUTE', fake_user=True)
+    finally:
+        bpy.data.scenes.remove(scene)
+
+def shared_print_folders(prints, properties):
+    # Names of the folders more than one print would be exported into
+    names = Counter(f"{properties.export_prefix}_{name}" if properties.export_prefix else name for name, _, _ in prints)
+    return sorted(name for name, count in names.items() if count > 1)
+
+def split_prints(prints, count):
+    # Biggest prints first, each onto the worker with the least work so far
+    loads = [0] * count
+    chunks = [[] for _ in range(count)]
+    for print_job in sorted(prints, key=lambda job: -estimated_print_steps(job[1], job[2])):
+        worker = loads.index(min(loads))
+        chunks[worker].append(print_job)
+        loads[worker] += estimated_print_steps(print_job[1], print_job[2])
+    return [chunk for chunk in chunks if chunk]
+
+def finished_print_count(log_path):
+    try:
+        with open(log_path, errors="replace") as f:
+            return len(FINISHED_PRINT_LINE.findall(f.read()))
+    except OSError:
+        return 0
+
+def merge_worker_result(summary, result):
+    for key in ("exported", "up_to_date", "size_failures", "texture_failures"):
+        summary.setdefault(key, []).extend(result.get(key) or [])
+    for key in ("print_stats", "collision_matches"):
+        summary[key].update(result.get(key) or {})
+    for key in ("collisions", "unchanged_textures", "reclaimed_bytes"):
+        summary[key] = summary.get(key, 0) + (result.get(key) or 0)
+    summary["texture_wait"] = max(summary["texture_wait"], result.get("texture_wait") or 0.0)
+
+def set_export_progress(context, factor, text=""):
+    export_progress.update(running=factor is not None, factor=factor or 0.0, text=text)
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+def reset_export_summary(mode):
+    last_export_summary.clear()
+    last_export_summary.update(mode=mode, result="CANCELLED", exported=[], up_to_date=[], size_failures=[], collision_matches={}, print_stats={}, texture_wait=0.0, started=time.perf_counter())
+    return last_export_summary
+
+def sizeCheck(objects=None):
     properties = bpy.context.scene.votv_properties
+    dimensions = calculate_overall_bounding_box(objects if objects is not None else bpy.context.selected_objects) or (0.0, 0.0, 0.0)
+    return size_check_message(dimensions, properties.sizelimit)
+
+def size_check_message(dimensions, sizelimit):
     returnMsg = "Success: Completed"
-    maxX, maxY, maxZ = getSizeLimit(properties.sizelimit)
+    maxX, maxY, maxZ = getSizeLimit(sizelimit)
+    bb_x, bb_y, bb_z = dimensions
 
-    bb_x, bb_y, bb_z = calculate_overall_bounding_box(bpy.context.selected_objects)
-    
     x_dim = round(bb_x / 2, 3)
     y_dim = round(bb_y / 2, 3)
     z_dim = round(bb_z / 2, 3)
@@ -160,7 +1451,375 @@ def sizeCheck():
     if all(dim < threshold for dim, threshold in zip([x_dim, y_dim, z_dim], [10, 10, 15])):
         returnMsg = "WARNING: Model is very tiny, it probably won't be able to be seen in-game due to its size\nYour model has still been exported to Voices of the Void"
 
-    return returnMsg   
+    return returnMsg
+
+def gather_prints(context, properties):
+    # (name, objects, collisions) of every print the export mode makes and the number of
+    # skipped non-printable objects. Raises ValueError when there is nothing to export.
+
+    # Nothing in the scene is duplicated, converted or selected: meshes are read
+    # from the evaluated depsgraph and written straight to the OBJ.
+    if properties.export_mode == 'SCENE':
+        candidates = [obj for obj in context.view_layer.objects if obj.visible_get() and not obj.hide_select]
+    else:
+        candidates = context.selected_objects
+
+    printable = [obj for obj in candidates if obj.type in PRINTABLE_TYPES and not obj.name.startswith("UCX_")]
+    skipped_count = sum(1 for obj in candidates if obj.type not in PRINTABLE_TYPES)
+    collision_index = CollisionIndex(context.scene, context.view_layer)
+
+    if properties.export_mode == 'SELECTED' or (properties.export_mode == 'INDIVIDUAL' and len(context.selected_objects) == 1):
+
+        if not printable:
+            raise ValueError("No objects selected for export")
+
+        name = properties.modelname or (context.active_object if context.active_object in printable else printable[0]).name
+        collisions = collision_index.match(name)
+        prints = [(name, printable, collisions)]
+
+    elif properties.export_mode == 'INDIVIDUAL':
+
+        if not printable:
+            raise ValueError("No objects selected for export")
+
+        prints = []
+        for object in printable:
+            name = properties.modelname or object.name
+            collisions = collision_index.match(name)
+            prints.append((name, [object], collisions))
+
+    elif properties.export_mode == 'SCENE':
+
+        name = properties.modelname or (context.active_object.name if context.active_object else "")
+
+        if not name:
+            raise ValueError("A model name or at least an object must be selected to use scene export.")
+
+        prints = [(name, printable, collision_index.collisions)]
+
+    return prints, skipped_count
+
+def evaluated_mesh_counts(obj, depsgraph):
+    # (vertices, faces, loops) of the evaluated mesh, no attribute is read
+    obj_eval = obj.evaluated_get(depsgraph)
+    if obj_eval.type == 'MESH':
+        mesh = obj_eval.data
+        return len(mesh.vertices), len(mesh.polygons), len(mesh.loops)
+
+    mesh = obj_eval.to_mesh()
+    try:
+        return (len(mesh.vertices), len(mesh.polygons), len(mesh.loops)) if mesh else (0, 0, 0)
+    finally:
+        obj_eval.to_mesh_clear()
+
+def exported_texture_sizes(materials, texture_budget):
+    # (material name, texture type) -> (width, height) of the textures export_material_steps
+    # writes, after the texture budget. The PBRCALC maps become one pbr texture.
+    sizes = {}
+    for material in materials:
+        if not material.use_nodes or not material.node_tree:
+            continue
+        images = {}
+        for node in material.node_tree.nodes:
+            if node.type == 'TEX_IMAGE' and node.image and node.image.size[0] > 0 and node.image.size[1] > 0:
+                images.setdefault(node.label or node.image.name, node.image)
+
+        for setting in material.material_settings:
+            image = images.get(setting.imageName)
+            if image is None:
+                continue
+            width, height = image.size
+            size = imageops.fitted_size(width, height, texture_budget) or (width, height)
+            texture_type = "pbr" if setting.materialType.startswith("PBRCALC") else setting.materialType
+            sizes[(material.name, texture_type)] = max(sizes.get((material.name, texture_type), (0, 0)), size)
+            if texture_type == "emissive":
+                sizes.setdefault((material.name, "diffuse"), size)
+    return sizes
+
+def analyze_print(name, objects, collisions, depsgraph, properties):
+    # What a print will cost in game, from the evaluated data and without writing anything
+    vertices = faces = loops = 0
+    materials = set()
+    draw_calls = set()
+    for obj in objects:
+        object_vertices, object_faces, object_loops = evaluated_mesh_counts(obj, depsgraph)
+        vertices += object_vertices
+        faces += object_faces
+        loops += object_loops
+        slots = [slot.material for slot in obj.material_slots] or [None]
+        materials.update(material for material in slots if material)
+        draw_calls.update(material.name if material else None for material in slots)
+    triangles = loops - 2 * faces
+
+    # Decimation and triangulation on export change what ends up in the OBJ
+    exported_triangles = min(triangles, properties.triangle_budget) if properties.triangle_budget else triangles
+    ratio = exported_triangles / triangles if triangles else 1.0
+    exported_vertices = int(vertices * ratio)
+    if properties.optimize_vertex_cache:
+        exported_faces, exported_loops = exported_triangles, exported_triangles * 3
+    else:
+        exported_faces, exported_loops = int(faces * ratio), int(loops * ratio)
+
+    if collisions:
+        hulls = len(collisions)
+        hull_vertices = sum(evaluated_mesh_counts(collision, depsgraph)[0] for collision in collisions)
+    elif properties.collision_hulls != 'NONE':
+        # Upper bounds, parts of a print can need fewer hulls and vertices
+        hulls = 1 if properties.collision_hulls == 'SINGLE' else properties.collision_hull_count
+        hull_vertices = hulls * properties.collision_hull_vertices
+    else:
+        hulls = hull_vertices = 0
+
+    textures = exported_texture_sizes(materials, getTextureBudget(properties))
+    if properties.texture_atlas:
+        # Grouped the way the export does it: each atlas is one material, one draw call
+        # and one texture per type in place of its materials' own
+        base_name = f"{properties.export_prefix}_{name}" if properties.export_prefix else name
+        atlases = print_atlases(base_name, objects, depsgraph, TextureWriter(texture_budget=getTextureBudget(properties)))
+        materials = {material for material in materials if material.name not in atlases} | set(atlases.values())
+        draw_calls = {atlases[material].name if material in atlases else material for material in draw_calls}
+        textures = {key: size for key, size in textures.items() if key[0] not in atlases}
+        for print_atlas in set(atlases.values()):
+            textures.update(((print_atlas.name, texture_type), print_atlas.size) for texture_type in print_atlas.types)
+    precision = properties.obj_precision if properties.compact_obj else 6
+    return {
+        "name": f"{properties.export_prefix}_{name}" if properties.export_prefix else name,
+        "triangles": triangles,
+        "exported_triangles": exported_triangles,
+        "vertices": exported_vertices,
+        "materials": len(materials),
+        "draw_calls": len(draw_calls),
+        "textures": {f"{texture_type}_{material}": size for (material, texture_type), size in sorted(textures.items())},
+        "vram_bytes": sum(costs.texture_vram_bytes(*size) for size in textures.values()),
+        "png_bytes": sum(costs.png_bytes(*size) for size in textures.values()),
+        "obj_bytes": costs.obj_bytes(exported_vertices, exported_faces, exported_loops, precision),
+        "hulls": hulls,
+        "hull_vertices": hull_vertices,
+    }
+
+def print_budgets(properties):
+    return {
+        "exported_triangles": properties.budget_triangles,
+        "draw_calls": properties.budget_draw_calls,
+        "vram_bytes": properties.budget_texture_memory * (1 << 20),
+        "hull_vertices": properties.budget_hull_vertices,
+    }
+
+def preflight_size_check(prints, sizelimit, depsgraph):
+    # Every print is checked before anything gets written. The bound_box extents of
+    # all objects are computed in one batch and are never smaller than the real
+    # ones, so only the prints failing on them have their evaluated vertices read.
+    # Returns the prints that fit, the (name, message) of the others and the warnings.
+    members = {}
+    for _, objects, collisions in prints:
+        for obj in objects + collisions:
+            if obj.type in PRINTABLE_TYPES:
+                members.setdefault(obj.name, obj)
+    extents = dict(zip(members, world_extents(list(members.values()))))
+
+    passed = []
+    failures = []
+    warnings = []
+    for print_job in prints:
+        name, objects, collisions = print_job
+        print_objects = [obj for obj in objects + collisions if obj.name in extents]
+        dimensions = dimensions_from_extents(np.array([extents[obj.name] for obj in print_objects]).reshape(-1, 2, 3))
+        message = size_check_message(dimensions, sizelimit)
+        if "ERROR" in message:
+            dimensions = dimensions_from_extents(evaluated_world_extents(print_objects, depsgraph))
+            message = size_check_message(dimensions, sizelimit)
+
+        if "ERROR" in message:
+            failures.append((name, message))
+            continue
+        if "WARNING" in message:
+            warnings.append((name, message))
+        passed.append(print_job)
+    return passed, failures, warnings
+
+#
+# Panel cache
+#
+
+# Filled lazily by the main panel and emptied by the depsgraph handler, so redraws
+# without scene changes don't touch the selection at all.
+panel_cache = {
+    "extents": {},
+    "dimensions": None,
+    "materials": None,
+}
+
+def invalidate_panel_cache(object_names=None):
+    if object_names is None:
+        panel_cache["extents"].clear()
+    else:
+        # Deleted (or renamed) objects are dropped too, their names would never be updated again
+        object_names = set(object_names) | {name for name in panel_cache["extents"] if name not in bpy.data.objects}
+        for name in object_names:
+            panel_cache["extents"].pop(name, None)
+    panel_cache["dimensions"] = None
+    panel_cache["materials"] = None
+
+def cached_dimensions(selected_objects):
+    if panel_cache["dimensions"] is None:
+        extents = panel_cache["extents"]
+        printable = [obj for obj in selected_objects if obj.type in PRINTABLE_TYPES]
+        missing = [obj for obj in printable if obj.name not in extents]
+        for obj, extent in zip(missing, world_extents(missing)):
+            extents[obj.name] = extent
+
+        selected_extents = np.array([extents[obj.name] for obj in printable]).reshape(-1, 2, 3)
+        panel_cache["dimensions"] = dimensions_from_extents(selected_extents)
+    return panel_cache["dimensions"]
+
+def cached_material_names(selected_objects):
+    if panel_cache["materials"] is None:
+        names = {}
+        for obj in selected_objects:
+            if obj.type == 'MESH':
+                for mat_slot in obj.material_slots:
+                    if mat_slot.material and mat_slot.material.material_settings:
+                        names.setdefault(mat_slot.material.name, None)
+        panel_cache["materials"] = list(names)
+    return panel_cache["materials"]
+
+# Watch mode: the depsgraph handler collects what was edited and a timer exports
+# the prints it touches once the edits stop for watch_delay seconds.
+watch_state = {
+    "objects": set(),
+    "materials": set(),
+    "everything": False,
+    "last_edit": 0.0,
+    "settings": None,
+    "exporting": False,
+}
+
+def watched_settings(properties):
+    settings = {key: getattr(properties, key) for key in FINGERPRINT_SETTINGS}
+    settings.update(modelname=properties.modelname, export_prefix=properties.export_prefix, properties_file=build_properties_file(properties))
+    return json.dumps(settings, sort_keys=True)
+
+def reset_watch_state(properties=None):
+    watch_state["objects"].clear()
+    watch_state["materials"].clear()
+    watch_state["everything"] = False
+    watch_state["settings"] = watched_settings(properties) if properties else None
+
+def materials_using_image(image):
+    return {material.name for material in bpy.data.materials if material.use_nodes and material.node_tree
+            and any(node.type == 'TEX_IMAGE' and node.image == image for node in material.node_tree.nodes)}
+
+def collect_watch_updates(scene, depsgraph):
+    # The export's own temporary datablocks also show up here, hence the exporting flag
+    if watch_state["exporting"]:
+        return
+
+    edited = False
+    for update in depsgraph.updates:
+        block = update.id.original
+        if isinstance(block, bpy.types.Object):
+            if is_export_datablock("objects", block):
+                continue
+            if (update.is_updated_transform or update.is_updated_geometry) and block.name in scene.objects:
+                watch_state["objects"].add(block.name)
+                edited = True
+        elif isinstance(block, bpy.types.Material):
+            watch_state["materials"].add(block.name)
+            edited = True
+        elif isinstance(block, bpy.types.Image):
+            # Texture painting, exports loading and freeing pixels don't make an image dirty
+            if block.is_dirty and not is_export_datablock("images", block):
+                watch_state["materials"].update(materials_using_image(block))
+                edited = True
+        elif isinstance(block, bpy.types.Scene):
+            # Selection changes also update the scene, only print settings count
+            settings = watched_settings(scene.votv_properties)
+            if watch_state["settings"] is not None and settings != watch_state["settings"]:
+                watch_state["everything"] = True
+                edited = True
+            watch_state["settings"] = settings
+
+    if edited:
+        watch_state["last_edit"] = time.monotonic()
+        if not bpy.app.timers.is_registered(watch_timer):
+            bpy.app.timers.register(watch_timer, first_interval=scene.votv_properties.watch_delay)
+
+def watch_timer():
+    properties = bpy.context.scene.votv_properties
+    if not properties.watch_mode:
+        reset_watch_state()
+        return None
+
+    # An export is still running (from the panel or this timer), the edits are kept for afterwards
+    if export_progress["running"] or export_session:
+        return 0.5
+
+    # Still editing, wait until the edits stop
+    remaining = properties.watch_delay - (time.monotonic() - watch_state["last_edit"])
+    if remaining > 0:
+        return remaining
+
+    window = next(iter(bpy.context.window_manager.windows), None)
+    if window is None:
+        return None
+
+    with bpy.context.temp_override(window=window):
+        # Edit mode changes only reach the evaluated mesh once edit mode is left
+        if bpy.context.mode != 'OBJECT':
+            return 0.5
+
+        changed = {"objects": sorted(watch_state["objects"]), "materials": sorted(watch_state["materials"])}
+        watched = "" if watch_state["everything"] else json.dumps(changed)
+        edited_at = watch_state["last_edit"]
+        reset_watch_state(properties)
+
+        watch_state["exporting"] = True
+        try:
+            result = bpy.ops.object.export_print('EXEC_DEFAULT', watched=watched)
+        except RuntimeError as e:
+            print(f"Watch mode export failed: {e}")
+            return None
+        finally:
+            watch_state["exporting"] = False
+
+    if result == {'FINISHED'}:
+        exported = last_export_summary.get("exported", [])
+        if exported:
+            print(f"Watch mode exported {', '.join(exported)} {time.monotonic() - edited_at:.2f} s after the last edit")
+    return None
+
+def watch_mode_update(self, context):
+    reset_watch_state(self)
+    if not self.watch_mode and bpy.app.timers.is_registered(watch_timer):
+        bpy.app.timers.unregister(watch_timer)
+
+def print_is_affected(objects, collisions, changed):
+    changed_objects = set(changed.get("objects", ()))
+    changed_materials = set(changed.get("materials", ()))
+    if any(obj.name in changed_objects for obj in objects) or any(collision.name in changed_objects for collision in collisions):
+        return True
+    return any(slot.material and slot.material.name in changed_materials for obj in objects for slot in obj.material_slots)
+
+@bpy.app.handlers.persistent
+def votv_depsgraph_update(scene, depsgraph):
+    updated = set()
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Object) and (update.is_updated_transform or update.is_updated_geometry):
+            updated.add(update.id.name)
+    invalidate_panel_cache(updated)
+
+    if scene.votv_properties.watch_mode:
+        collect_watch_updates(scene, depsgraph)
+
+@bpy.app.handlers.persistent
+def votv_frame_change(*args):
+    # Frame changes don't go through depsgraph_update_post, any object may be animated
+    invalidate_panel_cache()
+
+@bpy.app.handlers.persistent
+def votv_reset_cache(*args):
+    invalidate_panel_cache()
+    reset_watch_state()
 
 #
 # Classes
@@ -207,9 +1866,78 @@ class VOTVExporterPreferences(bpy.types.AddonPreferences):
         subtype='DIR_PATH'
     )
 
+    parallel_png : bpy.props.BoolProperty(
+        name="Parallel PNG encoding",
+        default=False,
+        description="Encode exported textures on worker threads instead of one after another on the main thread"
+    )
+    png_workers : bpy.props.IntProperty(
+        name="Encoding workers",
+        default=0,
+        min=0,
+        max=64,
+        description="Number of PNG encoding threads, 0 uses every core"
+    )
+    png_compression : bpy.props.IntProperty(
+        name="PNG compression",
+        subtype='PERCENTAGE',
+        default=15,
+        min=0,
+        max=100,
+        description="Compression used by the parallel encoder, same scale as Blender's PNG compression"
+    )
+
+    parallel_individual : bpy.props.BoolProperty(
+        name="Worker processes",
+        default=False,
+        description="Export Individual objects mode with several background Blender processes, from a snapshot of the objects being exported"
+    )
+    individual_workers : bpy.props.IntProperty(
+        name="Processes",
+        default=max(1, (os.cpu_count() or 2) // 2),
+        min=1,
+        max=64,
+        description="Number of Blender processes exporting at once, each one uses about as much memory as the objects it exports"
+    )
+
+    shared_texture_store : bpy.props.BoolProperty(
+        name="Shared texture store",
+        default=False,
+        description="Encode every unique texture once into a store inside the export folder and hard link it into each print (copied where links aren't supported)"
+    )
+
+    timing_log : bpy.props.BoolProperty(
+        name="Timing log",
+        default=False,
+        description=f"Append the time every export stage took to {TIMING_LOG_NAME} in the export folder"
+    )
+    profile_export : bpy.props.BoolProperty(
+        name="Profile exports",
+        default=False,
+        description="Run exports under cProfile and save the stats as a .prof file next to the exported print"
+    )
+
     def draw(self, context):
         layout = self.layout
         layout.prop(self, "export_path")
+        layout.prop(self, "shared_texture_store")
+
+        diagnosticsRow = layout.row()
+        diagnosticsRow.prop(self, "timing_log")
+        diagnosticsRow.prop(self, "profile_export")
+
+        encodingBox = layout.box()
+        encodingBox.prop(self, "parallel_png")
+        encodingRow = encodingBox.row()
+        encodingRow.enabled = self.parallel_png
+        encodingRow.prop(self, "png_workers")
+        encodingRow.prop(self, "png_compression")
+
+        workersRow = layout.box().row()
+        workersRow.prop(self, "parallel_individual")
+        workersColumn = workersRow.column()
+        workersColumn.enabled = self.parallel_individual
+        workersColumn.prop(self, "individual_workers")
 
 class VOTVProperties(bpy.types.PropertyGroup):
     modelname : bpy.props.StringProperty(
@@ -235,6 +1963,127 @@ class VOTVProperties(bpy.types.PropertyGroup):
         name="Bypass Size Limit",
         default=False
     )
+    optimize_vertex_cache : bpy.props.BoolProperty(
+        name="Optimize Vertex Cache",
+        description="Triangulate prints and order their triangles and vertices so the GPU's vertex cache is reused as much as possible. Takes a few seconds per million triangles",
+        default=False
+    )
+    compact_obj : bpy.props.BoolProperty(
+        name="Compact OBJ",
+        description="Merge vertices, UVs and normals that are the same at the chosen precision and write no more digits than that",
+        default=False
+    )
+    obj_precision : bpy.props.IntProperty(
+        name="Decimals",
+        description="Digits written after the decimal point for positions and UVs (normals use 4 at most)",
+        default=5,
+        min=2,
+        max=8
+    )
+    export_variants : bpy.props.BoolProperty(
+        name="Export Variants",
+        description="Export every print once per row of the variant table, the geometry is only written once",
+        default=False
+    )
+    variant_table : bpy.props.StringProperty(
+        name="Variant Table",
+        description="CSV file with a 'name' column, one column per changed print property (lamp_color, lamp_intensity, physical_material, ...) and 'texture:<type>:<material>' columns for swapped textures",
+        default="",
+        subtype='FILE_PATH'
+    )
+    budget_triangles : bpy.props.IntProperty(
+        name="Triangles",
+        description="Most triangles a print should have in game, 0 is no limit",
+        default=20000,
+        min=0
+    )
+    budget_draw_calls : bpy.props.IntProperty(
+        name="Draw Calls",
+        description="Most materials (one draw call each) a print should use, 0 is no limit",
+        default=4,
+        min=0
+    )
+    budget_texture_memory : bpy.props.IntProperty(
+        name="Texture Memory (MB)",
+        description="Most video memory the textures of a print should take, 0 is no limit",
+        default=32,
+        min=0
+    )
+    budget_hull_vertices : bpy.props.IntProperty(
+        name="Collision Vertices",
+        description="Most UCX_ collision vertices a print should have, 0 is no limit",
+        default=256,
+        min=0
+    )
+    watch_mode : bpy.props.BoolProperty(
+        name="Watch Mode",
+        description="Export the prints of the current export mode again whenever their objects, collision, materials or properties are edited",
+        default=False,
+        update=watch_mode_update
+    )
+    watch_delay : bpy.props.FloatProperty(
+        name="Delay",
+        description="Seconds without edits before the edited prints are exported",
+        default=0.25,
+        min=0.05,
+        max=5.0
+    )
+    skip_unchanged : bpy.props.BoolProperty(
+        name="Skip Unchanged Prints",
+        description="Prints whose objects, collision, materials and properties did not change since they were last exported are left as they are",
+        default=True
+    )
+    triangle_budget : bpy.props.IntProperty(
+        name="Triangle Budget (0 = Unlimited)",
+        description="Most triangles a single print may have, prints above it are decimated on export (the objects in the scene are left as they are)",
+        default=0,
+        min=0
+    )
+    collision_hulls : bpy.props.EnumProperty(
+        name="Generate Collision",
+        description="Convex hull UCX_ collision written for prints that have no UCX_ meshes of their own",
+        items=[
+            ('NONE', "None", "Only export hand made UCX_ meshes"),
+            ('SINGLE', "Single hull", "One convex hull around the whole print"),
+            ('PARTS', "Per loose part", "One convex hull per loose part, up to the hull count")
+        ],
+        default='NONE'
+    )
+    collision_hull_vertices : bpy.props.IntProperty(
+        name="Max Hull Vertices",
+        default=32,
+        min=8,
+        max=255
+    )
+    collision_hull_count : bpy.props.IntProperty(
+        name="Max Hulls",
+        description="Loose parts beyond this count are added to the hull of the nearest larger part",
+        default=4,
+        min=2,
+        max=32
+    )
+    texture_atlas : bpy.props.BoolProperty(
+        name="Texture Atlas",
+        description="Pack the textures of a print's materials into one material per filter, with one texture per type, and remap the UVs to match. Materials with tiling UVs keep their own textures",
+        default=False
+    )
+    texture_budget : bpy.props.EnumProperty(
+        name="Texture Budget",
+        description="Largest texture size written on export, bigger textures are downscaled (the images in the .blend are left as they are)",
+        items=[
+            ('NONE', "Full resolution", "Export textures at their original size"),
+            ('PRINTER', "Printer default", "2048 px for the industrial printer, 1024 px for the desktop printer"),
+            ('CUSTOM', "Custom", "Use the size set below")
+        ],
+        default='NONE'
+    )
+    texture_budget_size : bpy.props.IntProperty(
+        name="Max Texture Size",
+        default=2048,
+        min=1,
+        max=16384,
+        subtype='PIXEL'
+    )
     export_mode : bpy.props.EnumProperty(
         name="Export Mode",
         description="Choose how to export the objects",
@@ -324,6 +2173,42 @@ class VOTVProperties(bpy.types.PropertyGroup):
         min=0.0
     )
 
+class AnalyzeButton(bpy.types.Operator):
+    bl_idname = "object.analyze_print"
+    bl_label = "Analyze"
+    bl_description = "Estimate what the prints of the current export mode will cost in game, nothing is exported"
+
+    @classmethod
+    def poll(cls, context):
+        return ExportButton.poll(context)
+
+    def execute(self, context):
+        properties = context.scene.votv_properties
+        try:
+            prints, _ = gather_prints(context, properties)
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {"CANCELLED"}
+
+        started = time.perf_counter()
+        depsgraph = context.evaluated_depsgraph_get()
+        budgets = print_budgets(properties)
+        last_print_analysis.clear()
+        for name, objects, collisions in prints:
+            analysis = analyze_print(name, objects, collisions, depsgraph, properties)
+            analysis["over_budget"] = costs.over_budget(analysis, budgets)
+            last_print_analysis.append(analysis)
+            over_budget = f", over budget: {', '.join(analysis['over_budget'])}" if analysis["over_budget"] else ""
+            print(f"{analysis['name']}: {analysis['exported_triangles']} triangles, {analysis['draw_calls']} draw call(s), "
+                  f"{format_bytes(analysis['vram_bytes'])} video memory, {analysis['hull_vertices']} collision vertices{over_budget}")
+
+        # Prints over budget are listed first
+        last_print_analysis.sort(key=lambda analysis: not analysis["over_budget"])
+        flagged = sum(1 for analysis in last_print_analysis if analysis["over_budget"])
+        self.report({'WARNING'} if flagged else {'INFO'},
+                    f"Analyzed {len(prints)} print(s) in {time.perf_counter() - started:.2f} s, {flagged} over budget.")
+        return {"FINISHED"}
+
 class CopyPosButton(bpy.types.Operator):
     bl_idname = "object.copy_position"
     bl_label = "Copy Position"
@@ -354,23 +2239,27 @@ class UpdateMaterialSettingsOperator(bpy.types.Operator):
         return context.selected_objects and context.mode == 'OBJECT'
 
     def execute(self, context):
+        processed = set()
         for obj in context.selected_objects:
             if obj.type == 'MESH':
                 for mat_slot in obj.material_slots:
-                    if mat_slot.material:
+                    if mat_slot.material and mat_slot.material.name not in processed:
                         material = mat_slot.material
+                        processed.add(material.name)
+                        if not material.node_tree:
+                            continue
                         if "material_settings" not in material:
                             material["material_settings"] = bpy.props.CollectionProperty(type=MaterialSettings)()
 
+                        known_images = {setting.image for setting in material.material_settings}
                         for node in material.node_tree.nodes:
-                            if node.type == 'TEX_IMAGE' and node.image:
-                                imagename = node.label or node.image.name
-                                exists = any(setting.image == node.image for setting in material.material_settings)
-                                if not exists:
-                                    new_setting = material.material_settings.add()
-                                    new_setting.image = node.image
-                                    new_setting.imageName = imagename
+                            if node.type == 'TEX_IMAGE' and node.image and node.image not in known_images:
+                                new_setting = material.material_settings.add()
+                                new_setting.image = node.image
+                                new_setting.imageName = node.label or node.image.name
+                                known_images.add(node.image)
 
+        invalidate_panel_cache()
         return {"FINISHED"}
 
 class ClearMaterialSettingsOperator(bpy.types.Operator):
@@ -387,6 +2276,7 @@ class ClearMaterialSettingsOperator(bpy.types.Operator):
                 for mat_slot in obj.material_slots:
                     if mat_slot.material:
                         mat_slot.material.material_settings.clear()
+        invalidate_panel_cache()
         return {"FINISHED"}
     
 #
@@ -398,11 +2288,76 @@ class ExportButton(bpy.types.Operator):
     bl_label = "Export OBJ"
     bl_description = "Export selected objects or the entire scene to OBJ format. Use the properties panel to configure export settings."
 
+    # Set by watch mode: JSON with the edited object and material names, only the prints using them are exported
+    watched : bpy.props.StringProperty(default="", options={'HIDDEN', 'SKIP_SAVE'})
+
     @classmethod
     def poll(cls, context):
         return (context.selected_objects and context.mode == 'OBJECT') or len(context.scene.votv_properties.modelname) > 0
 
-    def execute(self, context):
+    def export_print(self, context, export_path, name, objects, collisions, properties_file, writer, summary, files, variant=None, shared=None):
+        # With variants, shared carries what the print's earlier variants already
+        # computed and wrote: the geometry is only evaluated and written once.
+        properties = context.scene.votv_properties
+        baseName = f"{properties.export_prefix}_{name}" if properties.export_prefix else name
+        prefixedName = f"{baseName}_{variant.name}" if variant else baseName
+        texture_swaps = variant.texture_swaps if variant else None
+        shared = shared if shared is not None else {}
+        export_folder = os.path.join(export_path, prefixedName)
+        object_file_path = os.path.join(export_folder, f"{prefixedName}.obj")
+        # Variants all point to the same .mtl name so their OBJ and MTL files are identical
+        mtl_path = os.path.join(export_folder, f"{baseName if variant else prefixedName}.mtl")
+        stats = summary["print_stats"].setdefault(prefixedName, {})
+        timings = stats.setdefault("timings", {})
+        depsgraph = context.evaluated_depsgraph_get()
+
+        with timed_stage(timings, "fingerprint"):
+            if "geometry" not in shared:
+                shared["geometry"] = geometry_fingerprint(objects, collisions, depsgraph, writer)
+            fingerprint = print_fingerprint(shared["geometry"], properties, properties_file, writer, texture_swaps)
+            if properties.skip_unchanged and print_is_current(export_folder, object_file_path, mtl_path, fingerprint):
+                stats["up_to_date"] = True
+        if stats.get("up_to_date"):
+            yield prefixedName
+            return prefixedName
+
+        create_folder(self, export_folder)
+        if "obj" in shared:
+            # An earlier variant of this print already wrote the geometry
+            with timed_stage(timings, "geometry"):
+                link_texture(shared["obj"], staged_path(files, object_file_path))
+                link_texture(shared["mtl"], staged_path(files, mtl_path))
+            materials = shared["materials"]
+            atlases = shared["atlases"]
+            stats.update((key, value) for key, value in shared["stats"].items() if key != "timings")
+        else:
+            atlases = {}
+            if properties.texture_atlas:
+                with timed_stage(timings, "atlas"):
+                    atlases = print_atlases(baseName, objects, depsgraph, writer, shared.get("swapped_materials", ()))
+                stats["atlased_materials"] = len(atlases)
+
+            # Hulls are only generated for prints without hand made UCX_ meshes
+            hull_builder = None if collisions else hull_builder_from_properties(properties)
+            materials = yield from timed_steps(timings, "geometry", export_obj_steps(self, object_file_path, baseName, objects, collisions,
+                                                                                     depsgraph, files, properties.triangle_budget,
+                                                                                     stats, hull_builder, atlases, properties.optimize_vertex_cache,
+                                                                                     properties.obj_precision if properties.compact_obj else None,
+                                                                                     mtl_path))
+            if materials is None:
+                return None
+            if variant:
+                shared.update(pending_obj=object_file_path, pending_mtl=mtl_path, materials=materials, atlases=atlases, stats=stats)
+
+        summary["unchanged_textures"] += yield from timed_steps(timings, "textures", export_material_steps(materials, export_folder, writer, files,
+                                                                                                           texture_swaps))
+        summary["unchanged_textures"] += yield from timed_steps(timings, "textures", export_atlas_steps(atlases, export_folder, writer, files))
+        with timed_stage(timings, "properties"):
+            save_properties_file(export_folder, properties_file, materials, files, atlases)
+            save_print_manifest(export_folder, fingerprint, files)
+        return prefixedName
+
+    def prepare(self, context):
         properties = context.scene.votv_properties
         preferences = bpy.context.preferences.addons[__package__].preferences
         export_path = bpy.path.abspath(preferences.export_path)
@@ -415,208 +2370,342 @@ class ExportButton(bpy.types.Operator):
             self.report({'ERROR'}, "Export path does not exist.")
             return {"CANCELLED"}
 
-        exported_count = 0
-        collision_count = 0
-        skipped_count = 0
+        summary = reset_export_summary(properties.export_mode)
         
-        properties_file = {
-            "physical_material": properties.physical_material,
-            "emissive_strength": round(properties.emissive_strength, 3),
-            "is_lamp": int(properties.lamp),
-            "lamp_color": f"(R={round(properties.lamp_color[0], 3)},G={round(properties.lamp_color[1], 3)},B={round(properties.lamp_color[2], 3)})",
-            "lamp_offset": f"(X={round(properties.lamp_offset[0], 3)},Y={round(-properties.lamp_offset[1], 3)},Z={round(properties.lamp_offset[2], 3)})",
-            "lamp_intensity": round(properties.lamp_intensity, 3),
-            "lamp_attenuation": round(properties.lamp_attenuation, 3),
-            "lamp_shadows": int(properties.lamp_shadows),
-            "health": round(properties.health, 3),
-            "impact_resistance": round(properties.impact_resistance, 3),
-            "damage_resistance": round(properties.damage_resistance, 3),
-            "light_toggle": int(properties.lamp_toggle)
-        }
-
-        if properties.export_mode == 'SELECTED' or (properties.export_mode == 'INDIVIDUAL' and len(context.selected_objects) == 1):
-
-            bpy.context.view_layer.objects.active = context.selected_objects[0]
-
-            name = properties.modelname or bpy.context.active_object.name
-            prefixedName = f"{properties.export_prefix}_{name}" if properties.export_prefix else name
-            export_folder = os.path.join(export_path, prefixedName)
-            object_file_path = os.path.join(export_folder, f"{prefixedName}.obj")
-
-            selectAll(context.selected_objects, True)
-
-            bpy.ops.object.duplicate()
-            duplicatedObjects = context.selected_objects
-
-            bpy.ops.object.select_all(action='DESELECT')
-            selectAll(duplicatedObjects, True)
-            bpy.ops.object.convert(target='MESH')
-
-            bpy.context.view_layer.objects.active = duplicatedObjects[0]
-            bpy.ops.object.join()
-
-            joinedObject = bpy.context.active_object
-            bpy.ops.object.select_all(action='DESELECT')
-
-            for collision in bpy.context.scene.objects:
-                if collision.type == 'MESH' and collision.name.startswith("UCX_") and collision.name[4:] in name and collision.name in bpy.context.view_layer.objects:
-                    collision.select_set(True)
-                    collision_count += 1
-            
-            joinedObject.select_set(True)
-            bpy.context.view_layer.objects.active = joinedObject
-
-            if not properties.limitbypass:
-                sizeCheckReturn = sizeCheck()
-
-                if "ERROR" in sizeCheckReturn:
-                    self.report({'ERROR'}, sizeCheckReturn)
-
-                    # Clean up after error
-                    bpy.ops.object.select_all(action='DESELECT')
-                    joinedObject.select_set(True)
-                    bpy.ops.object.delete(use_global=False)
-
-                    return {"CANCELLED"}
-                elif "WARNING" in sizeCheckReturn:
-                    self.report({'WARNING'}, sizeCheckReturn)
-
-            create_folder(self, export_folder)
-            exportOBJ(self, object_file_path, True)
-            exportOBJMaterials(joinedObject, export_folder)
-            save_properties_file(export_folder, properties_file)
-
-            bpy.ops.object.select_all(action='DESELECT')
-            joinedObject.select_set(True)
-            bpy.ops.object.delete(use_global=False)
+        properties_file = build_properties_file(properties)
+
+        self.variants = []
+        if properties.export_variants:
+            table_path = bpy.path.abspath(properties.variant_table)
+            try:
+                self.variants = load_variant_table(table_path, properties)
+            except (OSError, ValueError) as e:
+                self.report({'ERROR'}, f"Could not read the variant table: {e}")
+                return {"CANCELLED"}
+            if not self.variants:
+                self.report({'ERROR'}, "The variant table has no variants.")
+                return {"CANCELLED"}
+            self.variant_table = table_path
 
-            self.report({'INFO'}, f"Exported selected object(s) with {collision_count} collision object(s) and skipped {skipped_count} non-mesh object(s).")
-                
-        elif properties.export_mode == 'INDIVIDUAL':
+        try:
+            prints, skipped_count = gather_prints(context, properties)
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {"CANCELLED"}
+        summary.update(skipped=skipped_count, collisions=0, unchanged_textures=0)
 
-            if not context.selected_objects:
-                self.report({'ERROR'}, "No objects selected for export")
+        if self.watched:
+            changed = json.loads(self.watched)
+            prints = [(name, objects, collisions) for name, objects, collisions in prints if print_is_affected(objects, collisions, changed)]
+            if not prints:
                 return {"CANCELLED"}
-            
-            for object in context.selected_objects:
-                bpy.ops.object.select_all(action='DESELECT')
-                bpy.context.view_layer.objects.active = object
-                object.select_set(True)
 
-                name = properties.modelname or bpy.context.active_object.name
+        # Oversized prints are left out up front, the others are still exported
+        if not properties.limitbypass:
+            started = time.perf_counter()
+            prints, failures, warnings = preflight_size_check(prints, properties.sizelimit, context.evaluated_depsgraph_get())
+            summary["size_check_seconds"] = time.perf_counter() - started
+            for name, message in warnings:
+                self.report({'WARNING'}, f"{name}: {message}")
+            for name, message in failures:
                 prefixedName = f"{properties.export_prefix}_{name}" if properties.export_prefix else name
-                export_folder = os.path.join(export_path, prefixedName)
-                object_file_path = os.path.join(export_folder, f"{prefixedName}.obj")
-
-                selectAll(context.selected_objects, True)
-
-                bpy.ops.object.duplicate()
-                duplicatedObject = context.selected_objects
-
-                selectAll(duplicatedObject, True)
-                bpy.ops.object.convert(target='MESH')
-                duplicatedObject = bpy.context.view_layer.objects.active
-
-
-                bpy.ops.object.select_all(action='DESELECT')
-                for collision in bpy.context.scene.objects:
-                    if collision.type == 'MESH' and collision.name.startswith("UCX_") and collision.name[4:] in name and collision.name in bpy.context.view_layer.objects:
-                        collision.select_set(True)
-                        collision_count += 1
-                duplicatedObject.select_set(True)
-                bpy.context.view_layer.objects.active = duplicatedObject
-
-                if not properties.limitbypass:
-                    sizeCheckReturn = sizeCheck()
-
-                    if "ERROR" in sizeCheckReturn:
-                        self.report({'ERROR'}, sizeCheckReturn)
-
-                        bpy.ops.object.select_all(action='DESELECT')
-                        duplicatedObject.select_set(True)
-                        bpy.ops.object.delete(use_global=False)
-
-                        return {"CANCELLED"}
-                    elif "WARNING" in sizeCheckReturn:
-                        self.report({'WARNING'}, sizeCheckReturn)
-
-                create_folder(self, export_folder)
-                exportOBJ(self, object_file_path, True)
-                exportOBJMaterials(duplicatedObject, export_folder)
-                save_properties_file(export_folder, properties_file)
-
-                bpy.ops.object.select_all(action='DESELECT')
-                duplicatedObject.select_set(True)
-                bpy.ops.object.delete(use_global=False)
-
-                exported_count+=        1
-
-            self.report({'INFO'}, f"Exported {exported_count} individual object(s) with {collision_count} collision object(s) and skipped {skipped_count} non-mesh object(s).")
-
-
-        elif properties.export_mode == 'SCENE':
-
-            name = properties.modelname or bpy.context.active_object.name
-
-            if not name:
-                self.report({'ERROR'}, "A model name or at least an object must be selected to use scene export.")
+                self.report({'ERROR'}, f"{prefixedName}: {message}")
+                summary["size_failures"].append({"name": prefixedName, "message": message})
+            if not prints:
                 return {"CANCELLED"}
-            
-            prefixedName = f"{properties.export_prefix}_{name}" if properties.export_prefix else name
-            export_folder = os.path.join(export_path, prefixedName)
-            object_file_path = os.path.join(export_folder, f"{prefixedName}.obj")
-
-            bpy.ops.object.select_all(action='SELECT')
-            selectAll(context.selected_objects, True)
-
-            bpy.context.view_layer.objects.active = context.selected_objects[0]
-
-            bpy.ops.object.duplicate()
-            duplicatedObjects = context.selected_objects
 
-            selectAll(duplicatedObjects, True)
-            bpy.ops.object.convert(target='MESH')
-            bpy.context.view_layer.objects.active = duplicatedObjects[0]
-            bpy.ops.object.join()
-
-            joinedObject = bpy.context.active_object
-            bpy.ops.object.select_all(action='DESELECT')
-            joinedObject.select_set(True)
-
-            for collision in bpy.context.scene.objects:
-                if collision.type == 'MESH' and collision.name.startswith("UCX_") and collision.name in bpy.context.view_layer.objects:
-                    collision.select_set(True)
-                    collision_count += 1
-            
-            bpy.context.view_layer.objects.active = joinedObject
-
-            if not properties.limitbypass:
-                sizeCheckReturn = sizeCheck()
+        # Worker processes are only worth starting for several prints
+        self.parallel = (preferences.parallel_individual and properties.export_mode == 'INDIVIDUAL' and len(prints) > 1
+                         and preferences.individual_workers > 1 and not self.watched)
+        if self.parallel and unsaved_images(prints):
+            self.report({'WARNING'}, f"Unsaved images ({', '.join(sorted(unsaved_images(prints)))}), exporting without worker processes.")
+            self.parallel = False
+        shared_folders = shared_print_folders(prints, properties) if self.parallel else []
+        if shared_folders:
+            self.report({'WARNING'}, f"Several prints export into {', '.join(shared_folders)}, exporting without worker processes.")
+            self.parallel = False
+
+        self.export_path = export_path
+        self.prints = prints
+        self.properties_file = properties_file
+        if self.parallel:
+            self.total_steps = len(prints) * max(1, len(self.variants))
+        else:
+            self.total_steps = max(1, sum(estimated_print_steps(objects, collisions) for _, objects, collisions in prints) * max(1, len(self.variants)))
+        return None
 
-                if "ERROR" in sizeCheckReturn:
-                    self.report({'ERROR'}, sizeCheckReturn)
+    def export_steps(self, context):
+        properties = context.scene.votv_properties
+        preferences = bpy.context.preferences.addons[__package__].preferences
+        summary = last_export_summary
+        # Variants share their unchanged textures through the store
+        writer = texture_writer_from_preferences(preferences, self.export_path, getTextureBudget(properties), force_store=bool(self.variants))
+        files = None
+        session = ExportSession()
+        session.start()
+
+        try:
+            resolve_texture_swaps(self.variants, getattr(self, "variant_table", ""))
+            swapped_materials = {material for variant in self.variants for _, material in variant.texture_swaps}
+            jobs = [(print_job, variant) for print_job in self.prints for variant in (self.variants or [None])]
+
+            shared = {}
+            for (name, objects, collisions), variant in jobs:
+                if not variant or variant is self.variants[0]:
+                    shared = {"swapped_materials": swapped_materials}
+                properties_file = build_properties_file(properties, variant.overrides) if variant else self.properties_file
+
+                files = PrintFiles()
+                prefixedName = yield from self.export_print(context, self.export_path, name, objects, collisions, properties_file, writer, summary, files,
+                                                            variant, shared)
+                if prefixedName is None:
+                    return {"CANCELLED"}
+                if summary["print_stats"][prefixedName].get("up_to_date"):
+                    summary["up_to_date"].append(prefixedName)
+                    files = None
+                    print(f"{prefixedName}: up to date")
+                    continue
+
+                with timed_stage(summary["print_stats"][prefixedName]["timings"], "commit"):
+                    writer.commit()
+                    files.commit()
+                files = None
+                if "pending_obj" in shared:
+                    # Committed, later variants can link to these files
+                    shared["obj"] = shared.pop("pending_obj")
+                    shared["mtl"] = shared.pop("pending_mtl")
+
+                summary["exported"].append(prefixedName)
+                summary["collisions"] += len(collisions) + summary["print_stats"][prefixedName].get("generated_collisions", 0)
+                summary["collision_matches"][prefixedName] = [collision.name for collision in collisions]
+                print(f"{prefixedName}: {len(collisions)} collision object(s) {', '.join(collision.name for collision in collisions)}")
+        finally:
+            # Also runs when the modal export is cancelled: the print being written is dropped
+            if files:
+                writer.discard()
+                files.rollback()
+            finish_started = time.perf_counter()
+            try:
+                failures = writer.finish()
+            finally:
+                session.close()
+            summary["texture_wait"] = time.perf_counter() - finish_started
+            summary["reclaimed_bytes"] = session.reclaimed
+
+        return self.report_export(context, failures)
+
+    def report_export(self, context, failures):
+        properties = context.scene.votv_properties
+        preferences = bpy.context.preferences.addons[__package__].preferences
+        summary = last_export_summary
+
+        if failures:
+            self.report({'WARNING'}, f"{len(failures)} texture(s) could not be saved, see the system console.")
+
+        decimated = [stats for name, stats in summary["print_stats"].items() if name in summary["exported"] and stats["triangles_after"] < stats["triangles_before"]]
+        if decimated:
+            before = sum(stats["triangles_before"] for stats in decimated)
+            after = sum(stats["triangles_after"] for stats in decimated)
+            self.report({'INFO'}, f"Decimated {len(decimated)} print(s) from {before} to {after} triangles.")
+
+        self.report({'INFO'}, f"Freed {format_bytes(summary['reclaimed_bytes'])} of temporary data.")
+
+        if summary["size_failures"]:
+            names = ", ".join(failure["name"] for failure in summary["size_failures"])
+            self.report({'WARNING'}, f"{len(summary['size_failures'])} print(s) were too big and not exported: {names}")
+
+        if summary["up_to_date"]:
+            self.report({'INFO'}, f"{len(summary['up_to_date'])} print(s) were up to date and skipped.")
+
+        optimized = [stats for name, stats in summary["print_stats"].items() if name in summary["exported"] and "acmr_after" in stats]
+        if optimized:
+            triangles = sum(stats["triangles_after"] for stats in optimized)
+            before = sum(stats["acmr_before"] * stats["triangles_after"] for stats in optimized) / triangles
+            after = sum(stats["acmr_after"] * stats["triangles_after"] for stats in optimized) / triangles
+            self.report({'INFO'}, f"Vertex cache misses per triangle (ACMR): {before:.2f} before, {after:.2f} after reordering.")
+
+        resized = [stats for name, stats in summary["print_stats"].items() if name in summary["exported"] and "obj_bytes_before" in stats]
+        if resized:
+            before = sum(stats["obj_bytes_before"] for stats in resized)
+            after = sum(stats["obj_bytes"] for stats in resized)
+            self.report({'INFO'}, f"OBJ size: {format_bytes(before)} before, {format_bytes(after)} now.")
+
+        skipped_count = summary["skipped"]
+        collision_count = summary["collisions"]
+        unchanged_count = summary["unchanged_textures"]
+        if properties.export_mode == 'SCENE':
+            self.report({'INFO'}, f"Exported Scene with {collision_count} collision object(s) and skipped {skipped_count} non-mesh object(s), {unchanged_count} texture(s) were unchanged.")
+        elif len(self.prints) > 1:
+            self.report({'INFO'}, f"Exported {len(summary['exported'])} individual object(s) with {collision_count} collision object(s) and skipped {skipped_count} non-mesh object(s), {unchanged_count} texture(s) were unchanged.")
+        else:
+            self.report({'INFO'}, f"Exported selected object(s) with {collision_count} collision object(s) and skipped {skipped_count} non-mesh object(s), {unchanged_count} texture(s) were unchanged.")
+
+        summary.update(result="FINISHED", texture_failures=failures,
+                       seconds=round(time.perf_counter() - summary["started"], 3))
+
+        stage_totals = {"size_check": summary["size_check_seconds"]} if "size_check_seconds" in summary else {}
+        for name in summary["exported"] + summary["up_to_date"]:
+            for stage, seconds in summary["print_stats"][name].get("timings", {}).items():
+                stage_totals[stage] = stage_totals.get(stage, 0.0) + seconds
+        summary["stage_seconds"] = {stage: round(seconds, 4) for stage, seconds in stage_totals.items()}
+        if stage_totals:
+            self.report({'INFO'}, f"Export took {summary['seconds']:.2f} s: {format_timings(stage_totals)}, waiting for textures {summary['texture_wait']:.2f} s.")
+        if preferences.timing_log:
+            append_timing_log(self.export_path, summary)
+        return {"FINISHED"}
 
-                    # Clean up after error
-                    bpy.ops.object.select_all(action='DESELECT')
-                    joinedObject.select_set(True)
-                    bpy.ops.object.delete(use_global=False)
+    def worker_export_steps(self, context):
+        # The prints are split across "blender -b" processes running batch_export.py
+        # on a snapshot of the objects, each one exports its share into the export
+        # folder and their results are merged into one summary.
+        properties = context.scene.votv_properties
+        preferences = bpy.context.preferences.addons[__package__].preferences
+        summary = last_export_summary
+        summary.update(reclaimed_bytes=0, texture_failures=[])
+        chunks = split_prints(self.prints, preferences.individual_workers)
+        swapped_images = {bpy.data.images[source] for variant in self.variants for source in variant.texture_swaps.values() if source in bpy.data.images}
+
+        workers = []
+        with tempfile.TemporaryDirectory(prefix="votv_workers_") as work_dir:
+            snapshot_path = os.path.join(work_dir, "snapshot.blend")
+            write_print_snapshot(snapshot_path, self.prints, properties, swapped_images)
+            yield None
+
+            # The timing log and profile are written by this process for all workers
+            worker_preferences = rna_settings(preferences, skip={"export_path"})
+            worker_preferences.update(parallel_individual=False, timing_log=False, profile_export=False)
+            preferences_path = os.path.join(work_dir, "preferences.json")
+            with open(preferences_path, 'w') as f:
+                json.dump(worker_preferences, f)
+
+            script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "batch_export.py")
+            try:
+                for index, chunk in enumerate(chunks):
+                    objects_path = os.path.join(work_dir, f"{index}_objects.json")
+                    with open(objects_path, 'w') as f:
+                        json.dump([obj.name for _, objects, _ in chunk for obj in objects], f)
+                    result_path = os.path.join(work_dir, f"{index}.json")
+                    log_path = os.path.join(work_dir, f"{index}.log")
+                    command = [bpy.app.binary_path, "-b", snapshot_path, "--python", script, "--", "--worker", "--result", result_path,
+                               "--output", self.export_path, "--mode", "INDIVIDUAL", "--objects", objects_path,
+                               "--preferences", preferences_path, "--addon", __package__]
+                    with open(log_path, 'w') as log:
+                        workers.append((subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT), result_path, log_path))
+
+                finished = 0
+                while True:
+                    running = [process for process, _, _ in workers if process.poll() is None]
+                    done = sum(finished_print_count(log_path) for _, _, log_path in workers)
+                    while finished < min(done, self.total_steps):
+                        finished += 1
+                        yield f"{finished} of {self.total_steps} prints, {len(running)} worker(s) running"
+                    if not running:
+                        break
+                    # Nothing new, give the UI its turn without counting a step
+                    try:
+                        running[0].wait(timeout=0.05)
+                    except subprocess.TimeoutExpired:
+                        pass
+                    yield None
+            finally:
+                # Cancelled: the workers are killed before they can roll back, their staged
+                # files are removed here. A worker killed while moving a print's files into
+                # place leaves that print partly replaced, it is reported to be exported again.
+                killed = []
+                for process, _, _ in workers:
+                    if process.poll() is None:
+                        process.kill()
+                        process.wait()
+                        killed.append(process.pid)
+                if killed:
+                    folders = [folder for folder in remove_staged_files(self.export_path, killed) if folder != TEXTURE_STORE_NAME]
+                    print(f"Stopped {len(killed)} worker process(es), removed their unfinished files in: {', '.join(folders) or 'no print folder'}")
+                    if folders:
+                        self.report({'WARNING'}, f"Export stopped mid print, these prints may be incomplete and should be exported again: {', '.join(folders)}")
+
+            for process, result_path, log_path in workers:
+                try:
+                    with open(result_path) as f:
+                        result = json.load(f)
+                except (OSError, ValueError):
+                    result = {"status": "failed", "error": "Worker did not report a result"}
+
+                if result.get("status") == "failed":
+                    with open(log_path, errors="replace") as f:
+                        print("".join(f.readlines()[-20:]))
+                    self.report({'ERROR'}, f"A worker process failed: {result.get('error', 'see the system console')}")
+                merge_worker_result(summary, result)
+
+        if not summary["exported"] and not summary["up_to_date"]:
+            return {"CANCELLED"}
+        return self.report_export(context, summary["texture_failures"])
 
-                    return {"CANCELLED"}
-                elif "WARNING" in sizeCheckReturn:
-                    self.report({'WARNING'}, sizeCheckReturn)
+    def steps_for(self, context):
+        steps = self.worker_export_steps(context) if self.parallel else self.export_steps(context)
+        preferences = bpy.context.preferences.addons[__package__].preferences
+        if not preferences.profile_export:
+            return steps
 
-            create_folder(self, export_folder)
-            exportOBJ(self, object_file_path, True)
-            exportOBJMaterials(joinedObject, export_folder)
-            save_properties_file(export_folder, properties_file)
+        def profile_path():
+            exported = last_export_summary["exported"]
+            name = exported[0] if len(exported) == 1 else "votv_export"
+            return os.path.join(self.export_path, f"{name}.prof")
 
-            bpy.ops.object.select_all(action='DESELECT')
-            joinedObject.select_set(True)
-            bpy.ops.object.delete(use_global=False)
+        return profiled_steps(cProfile.Profile(), steps, profile_path)
 
-            self.report({'INFO'}, f"Exported Scene with {collision_count} collision object(s) and skipped {skipped_count} non-mesh object(s).")
-            
-        return {"FINISHED"}
+    def execute(self, context):
+        cancelled = self.prepare(context)
+        if cancelled:
+            return cancelled
+        return run_steps(self.steps_for(context))
+
+    def invoke(self, context, event):
+        cancelled = self.prepare(context)
+        if cancelled:
+            return cancelled
+
+        self.steps = self.steps_for(context)
+        self.done_steps = 0
+
+        window_manager = context.window_manager
+        self.timer = window_manager.event_timer_add(0.0, window=context.window)
+        window_manager.modal_handler_add(self)
+        set_export_progress(context, 0.0, "Starting export")
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC' and event.value == 'PRESS':
+            # Closing the generator runs its cleanup, only finished prints are kept
+            self.steps.close()
+            self.stop(context)
+            self.report({'WARNING'}, f"Export cancelled, {len(last_export_summary['exported'])} print(s) were completed.")
+            return {'CANCELLED'}
+
+        if event.type == 'TIMER':
+            try:
+                label = next(self.steps)
+            except StopIteration as done:
+                self.stop(context)
+                return done.value
+            except Exception:
+                self.stop(context)
+                raise
+
+            # One object or one texture per tick, None while waiting on worker processes
+            if label is None:
+                return {'RUNNING_MODAL'}
+            self.done_steps += 1
+            set_export_progress(context, min(self.done_steps / self.total_steps, 1.0), os.path.basename(label))
+            return {'RUNNING_MODAL'}
+
+        # Let the viewport be navigated but keep the scene from being edited mid export
+        if event.type in NAVIGATION_EVENTS:
+            return {'PASS_THROUGH'}
+        return {'RUNNING_MODAL'}
+
+    def stop(self, context):
+        context.window_manager.event_timer_remove(self.timer)
+        set_export_progress(context, None)
 
 #
 # Main GUI
@@ -650,6 +2739,19 @@ class VOTVE_PT_mainGUI(bpy.types.Panel):
         exportSettingsBox.prop(properties, 'modelname')
         exportSettingsBox.prop(properties, 'export_prefix')
         exportSettingsBox.prop(properties, 'export_mode')
+        exportSettingsBox.prop(properties, 'skip_unchanged')
+        watchRow = exportSettingsBox.row()
+        watchRow.prop(properties, 'watch_mode')
+        if properties.watch_mode:
+            watchRow.prop(properties, 'watch_delay')
+        exportSettingsBox.prop(properties, 'optimize_vertex_cache')
+        compactRow = exportSettingsBox.row()
+        compactRow.prop(properties, 'compact_obj')
+        if properties.compact_obj:
+            compactRow.prop(properties, 'obj_precision')
+        exportSettingsBox.prop(properties, 'export_variants')
+        if properties.export_variants:
+            exportSettingsBox.prop(properties, 'variant_table')
 
         sizeSettingsBox = MainColumn.box()
         sizeSettingsBox.label(text='Size settings:')
@@ -660,7 +2762,7 @@ class VOTVE_PT_mainGUI(bpy.types.Panel):
         dimensionRow = dimensionBox.row()
         
         if context.selected_objects:
-            bb_x, bb_y, bb_z = calculate_overall_bounding_box(context.selected_objects)
+            bb_x, bb_y, bb_z = cached_dimensions(context.selected_objects)
             x_dim = round(bb_x / 2, 3)
             y_dim = round(bb_y / 2, 3)
             z_dim = round(bb_z / 2, 3)
@@ -681,37 +2783,41 @@ class VOTVE_PT_mainGUI(bpy.types.Panel):
         sizeSettingsRow.box().label(text=f"Y={sizeLimit[1]}")
         sizeSettingsRow.box().label(text=f"Z={sizeLimit[2]}")
         sizeSettingsBox.prop(properties, 'limitbypass')
+        sizeSettingsBox.prop(properties, 'triangle_budget')
+        sizeSettingsBox.prop(properties, 'collision_hulls')
+        if properties.collision_hulls != 'NONE':
+            sizeSettingsBox.prop(properties, 'collision_hull_vertices')
+        if properties.collision_hulls == 'PARTS':
+            sizeSettingsBox.prop(properties, 'collision_hull_count')
 
         materialsSettingsBox = MainColumn.box()
         materialsSettingsBox.label(text="Material settings:")
         materialsSettingsBox.prop(properties, "emissive_strength")
+        materialsSettingsBox.prop(properties, "texture_atlas")
+        materialsSettingsBox.prop(properties, "texture_budget")
+        if properties.texture_budget == 'CUSTOM':
+            materialsSettingsBox.prop(properties, "texture_budget_size")
         
         selected_objects = context.selected_objects
-        curMats = set()
         
         materialsBox = materialsSettingsBox.box()
 
         if selected_objects:
             materialsBox.label(text="Materials:")
-            for obj in selected_objects:
-                if obj.type == 'MESH' and len(obj.material_slots) > 0:
-                    for mat_slot in obj.material_slots:
-                        if mat_slot.material:
-                            material_settings = mat_slot.material.material_settings
-                            if not material_settings:
-                                continue
-                            
-                            if mat_slot.material.name not in curMats:
-                                curMats.add(mat_slot.material.name)
-                                box = materialsBox.box()
-                                box.label(text=f"{mat_slot.material.name}:")
-                                for setting in material_settings:
-                                    materialRow = box.row()
-                                    
-                                    materialRow.label(text=setting.imageName)
-                                    materialRow.prop(setting, "materialType", text="Type")
-                                    materialRow.prop(setting, "materialFilter", text="Filter")
-            
+            for material_name in cached_material_names(selected_objects):
+                material = bpy.data.materials.get(material_name)
+                if not material:
+                    continue
+
+                box = materialsBox.box()
+                box.label(text=f"{material.name}:")
+                for setting in material.material_settings:
+                    materialRow = box.row()
+
+                    materialRow.label(text=setting.imageName)
+                    materialRow.prop(setting, "materialType", text="Type")
+                    materialRow.prop(setting, "materialFilter", text="Filter")
+
         else:
             materialsBox.label(text="Please select an object to see its material list")
 
@@ -721,7 +2827,11 @@ class VOTVE_PT_mainGUI(bpy.types.Panel):
         
         rowExport = MainColumn.row()
         rowExport.scale_y = 2
-        rowExport.operator(ExportButton.bl_idname, text="Export Objects")
+        if export_progress["running"]:
+            rowExport.progress(factor=export_progress["factor"], type='BAR', text=f"Exporting {export_progress['text']}")
+            MainColumn.label(text="Press Esc to cancel the export")
+        else:
+            rowExport.operator(ExportButton.bl_idname, text="Export Objects")
 
 class VOTVE_PT_properties(bpy.types.Panel):
     bl_label = "Properties:"
@@ -772,7 +2882,58 @@ class VOTVE_PT_lightProperties(bpy.types.Panel):
         lampBox.prop(properties, 'lamp_attenuation', text="Light Attenuation:")
         lampBox.prop(properties, 'lamp_shadows', text="Light Shadows")
 
-classes = (VOTVExporterPreferences, VOTVProperties, MaterialSettings, ExportButton, VOTVE_PT_mainGUI, VOTVE_PT_properties, VOTVE_PT_lightProperties, CopyPosButton, UpdateMaterialSettingsOperator, ClearMaterialSettingsOperator)
+class VOTVE_PT_analysis(bpy.types.Panel):
+    bl_label = "Cost analysis:"
+    bl_parent_id = "VOTVE_PT_mainGUI"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "VOTV Print Exporter"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    # Prints drawn with all their details, the others only as a line
+    DETAILED_PRINTS = 10
+
+    def draw(self, context):
+        layout = self.layout
+        properties = context.scene.votv_properties
+
+        budgetBox = layout.box()
+        budgetBox.label(text="Budgets per print (0 = no limit):")
+        budgetBox.prop(properties, 'budget_triangles')
+        budgetBox.prop(properties, 'budget_draw_calls')
+        budgetBox.prop(properties, 'budget_texture_memory')
+        budgetBox.prop(properties, 'budget_hull_vertices')
+
+        layout.operator(AnalyzeButton.bl_idname, text="Analyze")
+        if not last_print_analysis:
+            return
+
+        totalsBox = layout.box()
+        totalsBox.label(text=f"{len(last_print_analysis)} print(s), {sum(1 for a in last_print_analysis if a['over_budget'])} over budget")
+        totalsBox.label(text=f"{sum(a['exported_triangles'] for a in last_print_analysis)} triangles, {format_bytes(sum(a['vram_bytes'] for a in last_print_analysis))} of textures")
+        totalsBox.label(text=f"On disk: about {format_bytes(sum(a['obj_bytes'] + a['png_bytes'] for a in last_print_analysis))}")
+
+        for analysis in last_print_analysis[:self.DETAILED_PRINTS]:
+            printBox = layout.box()
+            printBox.label(text=analysis["name"], icon='ERROR' if analysis["over_budget"] else 'CHECKMARK')
+            column = printBox.column(align=True)
+
+            triangles = f"{analysis['exported_triangles']} triangles"
+            if analysis["exported_triangles"] < analysis["triangles"]:
+                triangles += f" (decimated from {analysis['triangles']})"
+            column.label(text=f"{triangles}, {analysis['vertices']} vertices", icon='ERROR' if "exported_triangles" in analysis["over_budget"] else 'NONE')
+            column.label(text=f"{analysis['materials']} material(s), {analysis['draw_calls']} draw call(s)", icon='ERROR' if "draw_calls" in analysis["over_budget"] else 'NONE')
+            column.label(text=f"{len(analysis['textures'])} texture(s), {format_bytes(analysis['vram_bytes'])} video memory", icon='ERROR' if "vram_bytes" in analysis["over_budget"] else 'NONE')
+            for texture, (width, height) in analysis["textures"].items():
+                column.label(text=f"    {texture}: {width}x{height}")
+            column.label(text=f"{analysis['hulls']} collision hull(s), {analysis['hull_vertices']} vertices", icon='ERROR' if "hull_vertices" in analysis["over_budget"] else 'NONE')
+            column.label(text=f"On disk: OBJ about {format_bytes(analysis['obj_bytes'])}, PNG about {format_bytes(analysis['png_bytes'])}")
+
+        hidden = len(last_print_analysis) - self.DETAILED_PRINTS
+        if hidden > 0:
+            layout.label(text=f"{hidden} more print(s), see the system console for all of them")
+
+classes = (VOTVExporterPreferences, VOTVProperties, MaterialSettings, ExportButton, AnalyzeButton, VOTVE_PT_mainGUI, VOTVE_PT_properties, VOTVE_PT_lightProperties, VOTVE_PT_analysis, CopyPosButton, UpdateMaterialSettingsOperator, ClearMaterialSettingsOperator)
 
 def register():
     for cls in classes:
@@ -781,7 +2942,24 @@ def register():
     bpy.types.Material.material_settings = bpy.props.CollectionProperty(type=MaterialSettings)
     bpy.types.Scene.votv_properties = bpy.props.PointerProperty(type=VOTVProperties)
 
+    bpy.app.handlers.depsgraph_update_post.append(votv_depsgraph_update)
+    bpy.app.handlers.frame_change_post.append(votv_frame_change)
+    bpy.app.handlers.load_post.append(votv_reset_cache)
+    bpy.app.handlers.undo_post.append(votv_reset_cache)
+    bpy.app.handlers.redo_post.append(votv_reset_cache)
+
 def unregister():
+    for handlers, handler in ((bpy.app.handlers.depsgraph_update_post, votv_depsgraph_update),
+                              (bpy.app.handlers.frame_change_post, votv_frame_change),
+                              (bpy.app.handlers.load_post, votv_reset_cache),
+                              (bpy.app.handlers.undo_post, votv_reset_cache),
+                              (bpy.app.handlers.redo_post, votv_reset_cache)):
+        if handler in handlers:
+            handlers.remove(handler)
+
+    if bpy.app.timers.is_registered(watch_timer):
+        bpy.app.timers.unregister(watch_timer)
+
     for cls in classes:
         bpy.utils.unregister_class(cls)
     
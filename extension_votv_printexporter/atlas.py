@@ -0,0 +1,104 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTIBILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Texture atlas layout and UV remapping, no bpy in here.
+# Tiles are (height, width, channels) arrays with the top row first, like the PNG writer's.
+
+import numpy as np
+
+# Gutter around each tile in pixels, filled with the tile's own edge pixels.
+# Bilinear sampling (and the mip maps the game builds) reads further across
+# the tile's border than nearest sampling does. The gutter is part of the tile's
+# cell, whose content is shrunk to make room for it, so power of two maps still
+# pack into power of two atlases.
+PADDING = {'0': 1, '1': 4}
+
+# Largest atlas side, the biggest texture the game's GPUs are sure to take
+MAX_SIZE = 8192
+
+def next_power_of_two(value):
+    return 1 << max(0, int(np.ceil(np.log2(max(1, value)))))
+
+def shelf_layout(sizes, width):
+    # Cells sorted by height are placed left to right in rows (shelves)
+    positions = [None] * len(sizes)
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    x = y = shelf_height = 0
+    for index in order:
+        cell_width, cell_height = sizes[index]
+        if x + cell_width > width:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+        positions[index] = (x, y)
+        x += cell_width
+        shelf_height = max(shelf_height, cell_height)
+    return positions, y + shelf_height
+
+def shelf_pack(sizes):
+    area = sum(w * h for w, h in sizes)
+    width = next_power_of_two(max(np.sqrt(area), max(w for w, _ in sizes)))
+    while True:
+        positions, used_height = shelf_layout(sizes, width)
+        height = next_power_of_two(used_height)
+        if height <= width * 2:
+            return positions, (width, height)
+        width *= 2
+
+def pack_tiles(sizes, padding, max_size=MAX_SIZE):
+    # Returns the top left corner and (width, height) of every tile's cell, gutter
+    # included, and the (width, height) of the atlas. Cells are halved until the
+    # atlas fits in max_size.
+    smallest = 2 * padding + 1
+    scale = 1
+    cells = None
+    while True:
+        scaled = [(max(smallest, w // scale), max(smallest, h // scale)) for w, h in sizes]
+        if scaled == cells:
+            # Every cell is as small as it gets
+            return positions, cells, size
+        cells = scaled
+        positions, size = shelf_pack(cells)
+        if max(size) <= max_size:
+            return positions, cells, size
+        scale *= 2
+
+def content_size(cell, padding):
+    return cell[0] - 2 * padding, cell[1] - 2 * padding
+
+def place_tile(atlas, tile, position, padding):
+    x, y = position
+    height, width = tile.shape[:2]
+    atlas[y:y + height + 2 * padding, x:x + width + 2 * padding] = np.pad(tile, ((padding, padding), (padding, padding), (0, 0)), mode='edge')
+
+def tile_uv_transform(position, size, atlas_size, padding):
+    # (scale, offset) taking the tile's 0-1 UVs to its content in the atlas, v goes up.
+    # size is the content's, position the cell's
+    x, y = position[0] + padding, position[1] + padding
+    width, height = size
+    atlas_width, atlas_height = atlas_size
+    scale = np.array((width / atlas_width, height / atlas_height))
+    offset = np.array((x / atlas_width, 1.0 - (y + height) / atlas_height))
+    return scale, offset
+
+def uvs_in_unit_square(uvs, tolerance=1e-4):
+    # Tiling UVs would sample the neighbouring tiles once packed
+    return len(uvs) == 0 or (uvs.min() >= -tolerance and uvs.max() <= 1.0 + tolerance)
+
+def remap_uvs(uvs, loop_slots, transforms):
+    # transforms maps a material slot to its (scale, offset)
+    remapped = uvs.copy()
+    for slot, (scale, offset) in transforms.items():
+        loops = loop_slots == slot
+        remapped[loops] = np.clip(uvs[loops], 0.0, 1.0) * scale + offset
+    return remapped
@@ -0,0 +1,274 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTIBILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Headless batch exporter.
+#
+# Driver, run with Blender or with a plain Python interpreter:
+#   blender -b --python batch_export.py -- prints/ --output Assets/printer --mode INDIVIDUAL --jobs 4
+#   python batch_export.py --blender /path/to/blender prints/ --output Assets/printer --summary summary.json
+#
+# Every .blend file is exported by its own "blender -b" worker process running
+# this same script with --worker, which writes a small JSON result the driver
+# collects into the summary.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+ADDON_NAMES = ("votv_print_exporter", "extension_votv_printexporter")
+
+def script_arguments(argv):
+    # Blender passes everything after "--" through to the script
+    return argv[argv.index("--") + 1:] if "--" in argv else argv[1:]
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(prog="batch_export", description="Export VOTV prints from many .blend files without opening Blender's UI.")
+    parser.add_argument("paths", nargs="*", help=".blend files or folders containing them")
+    parser.add_argument("--output", required=True, help="Export folder, usually the game's printer folder")
+    parser.add_argument("--mode", choices=("SELECTED", "INDIVIDUAL", "SCENE"), default="INDIVIDUAL")
+    parser.add_argument("--size-limit", choices=("FULLSIZE", "DESKTOP"), default=None)
+    parser.add_argument("--bypass-size-limit", action="store_true")
+    parser.add_argument("--select", choices=("all", "saved"), default="all",
+                        help="Export every printable object, or only what was selected when the file was saved")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="PROPERTY=VALUE",
+                        help="Override a print property, e.g. --set lamp=1 --set lamp_color=1,0.5,0")
+    parser.add_argument("--objects", default=None, help="JSON file with the names of the objects to export, instead of --select")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Number of Blender processes running at once")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds before a worker is killed")
+    parser.add_argument("--recursive", action="store_true", help="Also search sub folders for .blend files")
+    parser.add_argument("--summary", default=None, help="Where to write the JSON summary, printed to stdout when omitted")
+    parser.add_argument("--blender", default=None, help="Blender executable, defaults to the running Blender")
+    parser.add_argument("--addon", default=None, help="Module name of the installed exporter, found automatically when omitted")
+    parser.add_argument("--preferences", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--result", default=None, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+#
+# Driver
+#
+
+def collect_blend_files(paths, recursive):
+    blend_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            if recursive:
+                for root, _, files in os.walk(path):
+                    blend_files.extend(os.path.join(root, f) for f in sorted(files) if f.endswith(".blend"))
+            else:
+                blend_files.extend(os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith(".blend"))
+        elif path.endswith(".blend") and os.path.isfile(path):
+            blend_files.append(path)
+        else:
+            print(f"Skipping {path}: not a .blend file or folder")
+    return [os.path.abspath(f) for f in blend_files]
+
+def worker_command(blender, blend_file, args, result_path):
+    command = [blender, "-b", blend_file, "--python", os.path.abspath(__file__), "--",
+               "--worker", "--result", result_path, "--output", os.path.abspath(args.output),
+               "--mode", args.mode, "--select", args.select]
+    if args.size_limit:
+        command += ["--size-limit", args.size_limit]
+    if args.bypass_size_limit:
+        command.append("--bypass-size-limit")
+    if args.addon:
+        command += ["--addon", args.addon]
+    if args.objects:
+        command += ["--objects", os.path.abspath(args.objects)]
+    for override in args.overrides:
+        command += ["--set", override]
+    return command
+
+def run_blend_file(blender, index, blend_file, args, result_dir):
+    result_path = os.path.join(result_dir, f"{index}.json")
+    started = time.perf_counter()
+    entry = {"file": blend_file}
+
+    try:
+        process = subprocess.run(worker_command(blender, blend_file, args, result_path),
+                                 stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, timeout=args.timeout)
+        entry["returncode"] = process.returncode
+        output = process.stdout
+    except subprocess.TimeoutExpired as e:
+        entry["returncode"] = None
+        output = e.stdout.decode(errors="replace") if isinstance(e.stdout, bytes) else (e.stdout or "")
+        entry["error"] = f"Timed out after {args.timeout} seconds"
+
+    try:
+        with open(result_path) as f:
+            entry.update(json.load(f))
+    except (OSError, ValueError):
+        entry.setdefault("status", "failed")
+        entry.setdefault("error", "Worker did not report a result")
+        entry["log"] = output.splitlines()[-20:]
+
+    entry["seconds"] = round(time.perf_counter() - started, 3)
+    return entry
+
+def run_driver(args):
+    blender = args.blender or (bpy.app.binary_path if bpy else None)
+    if not blender:
+        print("No Blender executable, pass --blender when running outside of Blender")
+        return 1
+
+    blend_files = collect_blend_files(args.paths, args.recursive)
+    if not blend_files:
+        print("No .blend files found")
+        return 1
+
+    os.makedirs(args.output, exist_ok=True)
+    started = time.perf_counter()
+
+    with tempfile.TemporaryDirectory(prefix="votv_batch_") as result_dir:
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            files = list(pool.map(lambda job: run_blend_file(blender, *job, args, result_dir), enumerate(blend_files)))
+
+    totals = {status: sum(1 for entry in files if entry["status"] == status)
+              for status in ("exported", "skipped", "size_check_failed", "failed")}
+    summary = {
+        "output": os.path.abspath(args.output),
+        "mode": args.mode,
+        "seconds": round(time.perf_counter() - started, 3),
+        "totals": totals,
+        "prints_exported": sum(len(entry.get("exported", [])) for entry in files),
+        "files": files,
+    }
+
+    if args.summary:
+        with open(args.summary, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"Exported {summary['prints_exported']} print(s) from {len(files)} file(s), summary written to {args.summary}")
+    else:
+        print(json.dumps(summary, indent=2))
+
+    return 0 if totals["failed"] == 0 else 1
+
+#
+# Worker, runs inside "blender -b <file>"
+#
+
+def find_addon_module(requested):
+    import addon_utils
+
+    if requested:
+        candidates = [requested]
+    else:
+        candidates = [addon.module for addon in bpy.context.preferences.addons if addon.module.split(".")[-1] in ADDON_NAMES]
+        candidates += list(ADDON_NAMES)
+
+    # Make the package this script lives in importable as a fallback
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    for module in candidates:
+        if module in bpy.context.preferences.addons or addon_utils.enable(module, default_set=True):
+            return module
+    raise RuntimeError("VOTV Print Exporter is not installed, pass --addon with its module name")
+
+def parse_override(properties, override):
+    key, _, value = override.partition("=")
+    key = key.strip()
+    prop = properties.bl_rna.properties.get(key)
+    if prop is None:
+        raise ValueError(f"Unknown print property '{key}'")
+
+    def convert(text):
+        if prop.type == 'BOOLEAN':
+            return text.strip().lower() in {"1", "true", "yes", "on"}
+        if prop.type == 'INT':
+            return int(text)
+        if prop.type == 'FLOAT':
+            return float(text)
+        return text.strip()
+
+    if getattr(prop, "is_array", False):
+        return key, tuple(convert(part) for part in value.split(","))
+    return key, convert(value)
+
+def run_worker(args):
+    result = {"status": "failed"}
+    try:
+        module = find_addon_module(args.addon)
+        addon = sys.modules[module]
+
+        scene = bpy.context.scene
+        properties = scene.votv_properties
+        properties.export_mode = args.mode
+        if args.size_limit:
+            properties.sizelimit = args.size_limit
+        properties.limitbypass = properties.limitbypass or args.bypass_size_limit
+        for override in args.overrides:
+            key, value = parse_override(properties, override)
+            setattr(properties, key, value)
+
+        # Settings of the Blender session that started this worker
+        preferences = bpy.context.preferences.addons[module].preferences
+        if args.preferences:
+            with open(args.preferences) as f:
+                for key, value in json.load(f).items():
+                    setattr(preferences, key, value)
+        preferences.export_path = os.path.abspath(args.output)
+
+        view_layer = bpy.context.view_layer
+        if args.objects:
+            with open(args.objects) as f:
+                names = set(json.load(f))
+            for obj in view_layer.objects:
+                obj.select_set(obj.name in names)
+        elif args.select == "all":
+            for obj in view_layer.objects:
+                obj.select_set(obj.type in addon.PRINTABLE_TYPES and not obj.name.startswith("UCX_"))
+        if view_layer.objects.active is None or not view_layer.objects.active.select_get():
+            view_layer.objects.active = next(iter(bpy.context.selected_objects), None)
+
+        if not bpy.context.selected_objects and not (args.mode == 'SCENE' and properties.modelname):
+            result.update(status="skipped", reason="Nothing to export")
+        else:
+            addon.reset_export_summary(args.mode)
+            try:
+                bpy.ops.object.export_print()
+            except RuntimeError as e:
+                result["error"] = str(e)
+
+            summary = dict(addon.last_export_summary)
+            summary.pop("started", None)
+            summary["export_seconds"] = summary.pop("seconds", None)
+            result.update(summary)
+            if summary.get("size_failures") and not summary.get("exported"):
+                result["status"] = "size_check_failed"
+            elif summary.get("result") == "FINISHED":
+                result["status"] = "exported"
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    with open(args.result, 'w') as f:
+        json.dump(result, f)
+
+def main():
+    args = parse_arguments(script_arguments(sys.argv))
+    if args.worker:
+        run_worker(args)
+        return 0
+    return run_driver(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
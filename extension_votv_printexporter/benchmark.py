@@ -0,0 +1,299 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTIBILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Export benchmarks on synthetic scenes.
+#
+#   blender -b --python benchmark.py -- --objects 1 50 --texture-sizes 256 2048 8192 --results bench.json
+#   blender -b --python benchmark.py -- --baseline bench.json --results new.json
+#
+# Every case (scene size, texture size, collision, export mode) runs in its own
+# "blender -b" worker so the peak RSS of one case does not leak into the next.
+# A case records the export's wall time, the size of what it wrote and how much
+# the peak RSS grew during the export itself (export_rss_mb), on top of what
+# building the scene and its textures already took (setup_peak_rss_mb).
+# With --baseline the results are compared against an earlier run and the
+# script exits with 1 when a case got slower or bigger than --tolerance allows.
+
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from batch_export import find_addon_module, script_arguments
+
+MODES = ("SELECTED", "INDIVIDUAL", "SCENE")
+COMPARED_METRICS = ("seconds", "export_rss_mb")
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(prog="benchmark", description="Time VOTV print exports on generated scenes.")
+    parser.add_argument("--objects", type=int, nargs="+", default=[1, 25], help="Objects per scene")
+    parser.add_argument("--materials", type=int, nargs="+", default=[1, 8], help="Materials per scene")
+    parser.add_argument("--texture-sizes", type=int, nargs="+", default=[256, 1024, 4096], help="Texture sizes in pixels, up to 8192")
+    parser.add_argument("--segments", type=int, default=64, help="UV sphere segments, controls the triangles per object")
+    parser.add_argument("--collisions", choices=("with", "without", "both"), default="both", help="Add a UCX_ mesh per object")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case, the fastest is kept")
+    parser.add_argument("--results", default=None, help="Where to write the JSON results, printed to stdout when omitted")
+    parser.add_argument("--baseline", default=None, help="Earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed slowdown or memory growth, 0.15 is 15%%")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds before a worker is killed")
+    parser.add_argument("--blender", default=None, help="Blender executable, defaults to the running Blender")
+    parser.add_argument("--addon", default=None, help="Module name of the installed exporter, found automatically when omitted")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--result", default=None, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        # Windows
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb)
+        return counters.PeakWorkingSetSize / (1 << 20)
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+def case_key(case):
+    return f"{case['mode']}/objects={case['objects']}/materials={case['materials']}/texture={case['texture_size']}/ucx={case['collisions']}"
+
+def benchmark_cases(args):
+    collisions = {"with": (True,), "without": (False,), "both": (False, True)}[args.collisions]
+    for objects, materials, texture_size, with_collisions, mode in itertools.product(
+            args.objects, args.materials, args.texture_sizes, collisions, args.modes):
+        yield {"mode": mode, "objects": objects, "materials": min(materials, objects), "texture_size": texture_size,
+               "collisions": with_collisions, "segments": args.segments}
+
+#
+# Driver
+#
+
+def run_case(blender, case, args, result_dir):
+    result_path = os.path.join(result_dir, "case.json")
+    command = [blender, "-b", "--python", os.path.abspath(__file__), "--",
+               "--worker", json.dumps(case), "--result", result_path]
+    if args.addon:
+        command += ["--addon", args.addon]
+
+    best = None
+    for _ in range(max(1, args.repeat)):
+        if os.path.exists(result_path):
+            os.remove(result_path)
+        try:
+            process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, timeout=args.timeout)
+            output = process.stdout
+        except subprocess.TimeoutExpired:
+            return dict(case, status="failed", error=f"Timed out after {args.timeout} seconds")
+
+        try:
+            with open(result_path) as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return dict(case, status="failed", error="Worker did not report a result", log=output.splitlines()[-20:])
+
+        if result.get("status") != "ok":
+            return result
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+def compare_with_baseline(results, baseline, tolerance):
+    previous = {case_key(case): case for case in baseline.get("cases", []) if case.get("status") == "ok"}
+    regressions = []
+    for case in results:
+        old = previous.get(case_key(case))
+        if case.get("status") != "ok" or old is None:
+            continue
+        case["baseline"] = {}
+        for metric in COMPARED_METRICS:
+            if not old.get(metric):
+                continue
+            ratio = case[metric] / old[metric]
+            case["baseline"][metric] = {"value": old[metric], "ratio": round(ratio, 3)}
+            if ratio > 1.0 + tolerance:
+                regressions.append(f"{case_key(case)}: {metric} {old[metric]} -> {case[metric]} ({ratio:.2f}x)")
+    return regressions
+
+def run_driver(args):
+    blender = args.blender or (bpy.app.binary_path if bpy else None)
+    if not blender:
+        print("No Blender executable, pass --blender when running outside of Blender")
+        return 1
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="votv_benchmark_") as result_dir:
+        for case in benchmark_cases(args):
+            result = run_case(blender, case, args, result_dir)
+            results.append(result)
+            if result.get("status") == "ok":
+                print(f"{case_key(case)}: {result['seconds']:.3f} s, export +{result['export_rss_mb']:.0f} MB, peak {result['peak_rss_mb']:.0f} MB")
+            else:
+                print(f"{case_key(case)}: failed, {result.get('error')}")
+
+    report = {
+        "blender": bpy.app.version_string if bpy else None,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "cases": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_with_baseline(results, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+        for regression in regressions:
+            print(f"Regression: {regression}")
+
+    if args.results:
+        with open(args.results, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.results}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    failed = any(result.get("status") != "ok" for result in results)
+    return 1 if failed or regressions else 0
+
+#
+# Worker, runs inside "blender -b"
+#
+
+def clear_scene():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for collection in (bpy.data.meshes, bpy.data.materials, bpy.data.images):
+        for block in list(collection):
+            collection.remove(block)
+
+def benchmark_material(index, texture_size):
+    image = bpy.data.images.new(f"Bench_Texture_{index:03d}", texture_size, texture_size)
+    image.generated_type = 'COLOR_GRID'
+    # Changing the type frees the pixels, generate them now so it is not timed as part of the export
+    image.pixels[0]
+
+    material = bpy.data.materials.new(f"Bench_Material_{index:03d}")
+    material.use_nodes = True
+    texture = material.node_tree.nodes.new('ShaderNodeTexImage')
+    texture.image = image
+    material.node_tree.links.new(texture.outputs["Color"], material.node_tree.nodes["Principled BSDF"].inputs["Base Color"])
+    return material
+
+def build_scene(case):
+    import bmesh
+
+    clear_scene()
+    scene = bpy.context.scene
+    materials = [benchmark_material(index, case["texture_size"]) for index in range(case["materials"])]
+    columns = max(1, round(case["objects"] ** 0.5))
+
+    for index in range(case["objects"]):
+        name = f"Bench_{index:04d}"
+        mesh = bpy.data.meshes.new(name)
+        sphere = bmesh.new()
+        bmesh.ops.create_uvsphere(sphere, u_segments=case["segments"], v_segments=case["segments"] // 2, radius=5.0, calc_uvs=True)
+        sphere.to_mesh(mesh)
+        sphere.free()
+        mesh.materials.append(materials[index % len(materials)])
+
+        obj = bpy.data.objects.new(name, mesh)
+        obj.location = (index % columns * 12.0, index // columns * 12.0, 0.0)
+        scene.collection.objects.link(obj)
+        obj.select_set(True)
+
+        if case["collisions"]:
+            collision_mesh = bpy.data.meshes.new(f"UCX_{name}")
+            cube = bmesh.new()
+            bmesh.ops.create_cube(cube, size=10.0)
+            cube.to_mesh(collision_mesh)
+            cube.free()
+            collision = bpy.data.objects.new(f"UCX_{name}", collision_mesh)
+            collision.location = obj.location
+            scene.collection.objects.link(collision)
+
+    bpy.context.view_layer.objects.active = next(iter(bpy.context.selected_objects), None)
+    bpy.ops.material.update_settings()
+
+def output_size(path):
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+def run_worker(args):
+    case = json.loads(args.worker)
+    result = dict(case, status="failed")
+    try:
+        module = find_addon_module(args.addon)
+        addon = sys.modules[module]
+        build_scene(case)
+
+        properties = bpy.context.scene.votv_properties
+        properties.export_mode = case["mode"]
+        properties.limitbypass = True
+        # Every object exports under its own name and finds its own UCX_ mesh
+        properties.modelname = ""
+        setup_rss = peak_rss_mb()
+
+        with tempfile.TemporaryDirectory(prefix="votv_benchmark_export_") as export_path:
+            bpy.context.preferences.addons[module].preferences.export_path = export_path
+            addon.reset_export_summary(case["mode"])
+            started = time.perf_counter()
+            bpy.ops.object.export_print()
+            seconds = time.perf_counter() - started
+            written = output_size(export_path)
+
+        summary = addon.last_export_summary
+        export_rss = peak_rss_mb()
+        result.update(status="ok" if summary.get("result") == "FINISHED" else "failed",
+                      seconds=round(seconds, 4),
+                      peak_rss_mb=round(export_rss, 1),
+                      export_rss_mb=round(export_rss - setup_rss, 1),
+                      setup_peak_rss_mb=round(setup_rss, 1),
+                      prints=len(summary.get("exported", [])),
+                      output_mb=round(written / (1 << 20), 3))
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    with open(args.result, 'w') as f:
+        json.dump(result, f)
+
+def main():
+    args = parse_arguments(script_arguments(sys.argv))
+    if args.worker:
+        run_worker(args)
+        return 0
+    return run_driver(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTIBILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Size estimates for the print cost analyzer, no bpy in here.
+#
+# Nothing is written: OBJ sizes are counted from the line formats the OBJ writer
+# uses, textures are assumed to be uncompressed RGBA8 in video memory with a full
+# mip chain and PNG sizes are a typical compression ratio of the raw pixels.
+
+import math
+
+BYTES_PER_PIXEL = 4
+# A full mip chain adds a third to the base level
+MIP_CHAIN = 4 / 3
+# Typical PNG size relative to the raw RGBA pixels of game textures
+PNG_RATIO = 0.5
+
+def texture_vram_bytes(width, height):
+    return int(width * height * BYTES_PER_PIXEL * MIP_CHAIN)
+
+def png_bytes(width, height):
+    return int(width * height * BYTES_PER_PIXEL * PNG_RATIO)
+
+def obj_bytes(vertices, faces, loops, precision=6, normal_precision=4):
+    # Unique UVs and normals are taken to be about as many as the vertices, which
+    # holds for smooth meshes with few seams
+    def number(digits):
+        # Sign (half of the time), one integer digit, the point and a separating space
+        return digits + 3.5
+
+    index = len(str(max(1, vertices)))
+    vertex_lines = vertices * (2 + 3 * number(precision))
+    uv_lines = vertices * (3 + 2 * number(precision))
+    normal_lines = vertices * (3 + 3 * number(min(precision, normal_precision)))
+    # "f" and the newline, then " v/vt/vn" per corner
+    face_lines = faces * 2 + loops * (1 + 3 * index + 2)
+    return int(math.ceil(vertex_lines + uv_lines + normal_lines + face_lines))
+
+def over_budget(costs, budgets):
+    # Names of the costs above their budget, a budget of 0 is no limit
+    return [key for key, budget in budgets.items() if budget and costs.get(key, 0) > budget]
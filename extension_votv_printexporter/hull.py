@@ -0,0 +1,173 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTIBILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Convex hulls for generated UCX_ collision, no bpy in here.
+#
+# Large meshes are first cut down to the points furthest along a fixed set of
+# directions (one matrix product, every such point is a hull vertex), the hull
+# itself is then built incrementally from those few points.
+
+import numpy as np
+
+EPSILON = 1e-6
+
+def support_directions(count):
+    # Evenly spread unit vectors on a Fibonacci sphere
+    index = np.arange(count) + 0.5
+    z = 1.0 - 2.0 * index / count
+    radius = np.sqrt(1.0 - z * z)
+    angle = np.pi * (3.0 - np.sqrt(5.0)) * index
+    return np.stack((radius * np.cos(angle), radius * np.sin(angle), z), axis=-1)
+
+def support_points(points, directions):
+    # The point furthest along each direction, at most len(directions) of them
+    if len(points) <= len(directions):
+        return points
+    return points[np.unique(np.argmax(points @ directions.T, axis=0))]
+
+def loose_parts(vertex_count, loop_vertices, face_starts, face_sizes):
+    # Connected component label for every vertex, components are joined along the face edges
+    loop_faces = np.repeat(np.arange(len(face_sizes)), face_sizes)
+    next_loop = np.arange(len(loop_vertices)) + 1
+    face_ends = face_starts + face_sizes
+    last_corner = next_loop == face_ends[loop_faces]
+    next_loop[last_corner] = face_starts[loop_faces[last_corner]]
+    a, b = loop_vertices, loop_vertices[next_loop]
+
+    # Union-find run on every edge at once: the higher root of each edge joining two
+    # components is hooked onto the lower one, then the paths are compressed. Each
+    # round at least halves the number of components, whatever the vertex order.
+    parent = np.arange(vertex_count)
+    while len(a):
+        root_a, root_b = parent[a], parent[b]
+        joining = root_a != root_b
+        if not joining.any():
+            break
+        # Edges inside one component stay inside it, they are dropped for good
+        a, b = a[joining], b[joining]
+        root_a, root_b = root_a[joining], root_b[joining]
+        np.minimum.at(parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+    return np.unique(parent, return_inverse=True)[1].ravel()
+
+def initial_simplex(points):
+    first = int(np.argmin(points[:, 0]))
+    second = int(np.argmax(np.linalg.norm(points - points[first], axis=1)))
+    line = points[second] - points[first]
+    if np.linalg.norm(line) < EPSILON:
+        return None
+
+    third = int(np.argmax(np.linalg.norm(np.cross(points - points[first], line), axis=1)))
+    normal = np.cross(line, points[third] - points[first])
+    if np.linalg.norm(normal) < EPSILON:
+        return None
+
+    distances = (points - points[first]) @ normal
+    fourth = int(np.argmax(np.abs(distances)))
+    if abs(distances[fourth]) < EPSILON * np.linalg.norm(normal):
+        return None
+    return first, second, third, fourth
+
+def convex_hull(points):
+    # Returns (vertices, triangles) with outward facing triangles, None when the points are flat
+    points = np.unique(np.asarray(points, dtype=np.float64), axis=0)
+    if len(points) < 4:
+        return None
+    simplex = initial_simplex(points)
+    if simplex is None:
+        return None
+
+    scale = max(float(np.ptp(points, axis=0).max()), EPSILON)
+    tolerance = EPSILON * scale
+    inside = points[list(simplex)].mean(axis=0)
+
+    def oriented(a, b, c):
+        normal = np.cross(points[b] - points[a], points[c] - points[a])
+        return (a, c, b) if normal @ (inside - points[a]) > 0 else (a, b, c)
+
+    a, b, c, d = simplex
+    faces = [oriented(a, b, c), oriented(a, b, d), oriented(a, c, d), oriented(b, c, d)]
+
+    # Furthest points first, most of the rest then end up inside early on
+    order = np.argsort(-np.linalg.norm(points - inside, axis=1))
+    for index in order:
+        if index in simplex:
+            continue
+        face_array = np.array(faces)
+        origins = points[face_array[:, 0]]
+        normals = np.cross(points[face_array[:, 1]] - origins, points[face_array[:, 2]] - origins)
+        lengths = np.linalg.norm(normals, axis=1)
+        visible = ((points[index] - origins) * normals).sum(axis=1) > tolerance * np.maximum(lengths, EPSILON)
+        if not visible.any():
+            continue
+
+        visible_faces = [faces[i] for i in np.flatnonzero(visible)]
+        visible_edges = {(f[i], f[(i + 1) % 3]) for f in visible_faces for i in range(3)}
+        horizon = [edge for edge in visible_edges if (edge[1], edge[0]) not in visible_edges]
+        faces = [faces[i] for i in np.flatnonzero(~visible)] + [(u, v, int(index)) for u, v in horizon]
+
+    triangles = np.array(faces, dtype=np.int64)
+    used, triangles = np.unique(triangles, return_inverse=True)
+    return points[used], triangles.reshape(-1, 3)
+
+class HullBuilder:
+    # Collects the candidate points of a print, object by object, so the full
+    # meshes never have to be kept around
+    def __init__(self, max_vertices=32, max_hulls=1):
+        self.directions = support_directions(max_vertices)
+        self.max_hulls = max_hulls
+        self.parts = []
+
+    def add_mesh(self, positions, loop_vertices, face_starts, face_sizes):
+        if len(positions) == 0:
+            return
+        if self.max_hulls <= 1:
+            self.parts.append(support_points(positions, self.directions))
+            return
+
+        labels = loose_parts(len(positions), loop_vertices, face_starts, face_sizes)
+        order = np.argsort(labels, kind='stable')
+        runs = np.flatnonzero(np.diff(labels[order])) + 1
+        for part in np.split(order, runs):
+            self.parts.append(support_points(positions[part], self.directions))
+
+    def grouped_parts(self):
+        if len(self.parts) <= self.max_hulls:
+            return self.parts
+
+        # The largest parts keep a hull each, the others join the nearest of them
+        extents = np.array([np.ptp(part, axis=0) for part in self.parts])
+        centers = np.array([part.mean(axis=0) for part in self.parts])
+        kept = np.argsort(-np.prod(extents + EPSILON, axis=1))[:self.max_hulls]
+        distances = np.linalg.norm(centers[:, np.newaxis] - centers[kept], axis=2)
+        owner = np.argmin(distances, axis=1)
+        return [np.concatenate([self.parts[i] for i in np.flatnonzero(owner == k)]) for k in range(len(kept))]
+
+    def hulls(self):
+        if not self.parts:
+            return []
+        if self.max_hulls <= 1:
+            groups = [np.concatenate(self.parts)]
+        else:
+            groups = self.grouped_parts()
+
+        hulls = []
+        for points in groups:
+            hull = convex_hull(support_points(points, self.directions))
+            if hull is not None:
+                hulls.append(hull)
+        return hulls
@@ -0,0 +1,90 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTIBILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+# NumPy image resampling used on export, no bpy in here so it can run on worker threads.
+# Images are (height, width, channels) arrays.
+
+import numpy as np
+
+TILE_PIXELS = 1 << 20
+
+def fitted_size(width, height, max_size):
+    if not max_size or max(width, height) <= max_size:
+        return None
+    scale = max_size / max(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def nearest_downscale(pixels, width, height):
+    source_height, source_width = pixels.shape[:2]
+    rows = ((np.arange(height) + 0.5) * source_height / height).astype(np.intp)
+    columns = ((np.arange(width) + 0.5) * source_width / width).astype(np.intp)
+    return pixels[rows[:, np.newaxis], columns]
+
+def cumulative_at(cumulative, values, positions):
+    # Prefix sum at fractional positions, the partial pixel is added linearly
+    index = np.minimum(positions.astype(np.intp), len(values) - 1)
+    fraction = (positions - index).reshape((-1,) + (1,) * (values.ndim - 1))
+    return cumulative[index] + fraction * values[index]
+
+def area_resample_rows(pixels, edges):
+    # Average of the source rows covered by each [edges[i], edges[i + 1]) span
+    values = pixels.astype(np.float64)
+    cumulative = np.zeros((len(values) + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=cumulative[1:])
+    sums = cumulative_at(cumulative, values, edges[1:]) - cumulative_at(cumulative, values, edges[:-1])
+    return sums / (edges[1:] - edges[:-1]).reshape((-1,) + (1,) * (values.ndim - 1))
+
+def box_downscale(pixels, width, height):
+    # Whole-number ratios (the usual power of two textures) are a plain block mean
+    source_height, source_width = pixels.shape[:2]
+    row_factor = source_height // height
+    column_factor = source_width // width
+
+    result = np.empty((height, width) + pixels.shape[2:], dtype=np.float32)
+    rows_per_tile = max(1, TILE_PIXELS // (source_width * row_factor))
+    for y in range(0, height, rows_per_tile):
+        y_end = min(y + rows_per_tile, height)
+        block = pixels[y * row_factor:y_end * row_factor].reshape((y_end - y, row_factor, width, column_factor) + pixels.shape[2:])
+        result[y:y_end] = block.sum(axis=(1, 3), dtype=np.float32) / (row_factor * column_factor)
+    return result
+
+def area_downscale(pixels, width, height):
+    source_height, source_width = pixels.shape[:2]
+    if source_height % height == 0 and source_width % width == 0:
+        return box_downscale(pixels, width, height)
+
+    row_scale = source_height / height
+    column_edges = np.arange(width + 1) * (source_width / width)
+
+    result = np.empty((height, width) + pixels.shape[2:], dtype=np.float32)
+    rows_per_tile = max(1, int(TILE_PIXELS / (source_width * row_scale)))
+
+    # Tiles of output rows keep the float64 prefix sums small for 8K sources
+    for y in range(0, height, rows_per_tile):
+        y_end = min(y + rows_per_tile, height)
+        first_row = int(y * row_scale)
+        last_row = min(source_height, int(np.ceil(y_end * row_scale)))
+        row_edges = np.arange(y, y_end + 1) * row_scale - first_row
+
+        rows = area_resample_rows(pixels[first_row:last_row], row_edges)
+        result[y:y_end] = area_resample_rows(rows.swapaxes(0, 1), column_edges).swapaxes(0, 1)
+    return result
+
+def resize_pixels(pixels, width, height, nearest=False):
+    if nearest:
+        return nearest_downscale(pixels, width, height)
+
+    resized = area_downscale(pixels, width, height)
+    if pixels.dtype == np.uint8:
+        return np.clip(resized + 0.5, 0.0, 255.0).astype(np.uint8)
+    return resized
@@ -0,0 +1,217 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTIBILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Streaming OBJ writer working on NumPy mesh arrays, no bpy in here.
+
+import numpy as np
+
+WRITE_BUFFER = 1 << 20
+CHUNK_ROWS = 1 << 16
+
+class MeshArrays:
+    # One mesh already baked into OBJ space. uvs and normals are per loop (face corner),
+    # triangle_loops optionally holds the loops of each triangle of Blender's triangulation.
+    def __init__(self, name, positions, loop_vertices, face_starts, face_sizes, face_materials=None, material_names=None, uvs=None, normals=None,
+                 triangle_loops=None):
+        self.name = name
+        self.positions = positions
+        self.loop_vertices = loop_vertices
+        self.face_starts = face_starts
+        self.face_sizes = face_sizes
+        self.face_materials = face_materials if face_materials is not None else np.zeros(len(face_sizes), dtype=np.int32)
+        self.material_names = material_names or []
+        self.uvs = uvs
+        self.normals = normals
+        self.triangle_loops = triangle_loops
+
+    @property
+    def triangle_count(self):
+        return int((self.face_sizes - 2).sum())
+
+    def reverse_winding(self):
+        loop_faces = np.repeat(np.arange(len(self.face_sizes)), self.face_sizes)
+        starts = self.face_starts[loop_faces]
+        corner = np.arange(len(loop_faces)) - starts
+        order = starts + self.face_sizes[loop_faces] - 1 - corner
+
+        self.loop_vertices = self.loop_vertices[order]
+        if self.uvs is not None:
+            self.uvs = self.uvs[order]
+        if self.normals is not None:
+            self.normals = self.normals[order]
+        if self.triangle_loops is not None:
+            moved_to = np.empty_like(order)
+            moved_to[order] = np.arange(len(order))
+            self.triangle_loops = moved_to[self.triangle_loops.reshape(-1, 3)][:, ::-1].ravel()
+
+def first_use_unique(keys):
+    # Flat unique over one key per row, with the unique rows numbered in order of first use.
+    # Returns the row of the first use of each unique key and each row's index into those.
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return first[order], rank[inverse.ravel()]
+
+def row_keys(rows):
+    # Packs each row's raw bytes into one integer key when it fits, else a void key
+    rows = np.ascontiguousarray(rows)
+    width = rows.itemsize * rows.shape[1]
+    if width in (4, 8):
+        return rows.view(np.int32 if width == 4 else np.int64).ravel()
+    return rows.view(np.dtype((np.void, width))).ravel()
+
+def unique_rows(values, decimals=None):
+    # Rows that are exactly equal (or equal once rounded to decimals) share one index,
+    # kept in order of first use
+    if decimals is not None:
+        return weld_rows(values, decimals)
+    if len(values) == 0:
+        return values, np.empty(0, dtype=np.int64)
+    first, index = first_use_unique(row_keys(values))
+    return values[first], index
+
+def weld_rows(values, decimals):
+    # Rows that are equal once rounded to decimals share one index, kept in order of
+    # first use. The rounded rows are packed into one integer key (or their raw bytes)
+    # so a flat unique can be used instead of the much slower row-wise one.
+    if len(values) == 0:
+        return values, np.empty(0, dtype=np.int64)
+    quantized = np.round(values * 10.0 ** decimals).astype(np.int64)
+    low = quantized.min(axis=0)
+    bits = 63 // values.shape[1]
+    if (quantized.max(axis=0) - low < (1 << bits)).all():
+        keys = np.zeros(len(values), dtype=np.int64)
+        for column in range(values.shape[1]):
+            keys = (keys << bits) | (quantized[:, column] - low[column])
+    else:
+        keys = row_keys(quantized)
+
+    first, index = first_use_unique(keys)
+    return quantized[first] / 10.0 ** decimals, index
+
+class OBJWriter:
+    # With a precision set, positions, UVs and normals are welded at that many
+    # decimals (normals at 4 at most) and written with no more digits than that
+    def __init__(self, filepath, mtl_filename=None, precision=None):
+        self.file = open(filepath, 'w', buffering=WRITE_BUFFER, newline='\n')
+        self.precision = precision
+        self.bytes_written = 0
+        self.vertex_offset = 1
+        self.uv_offset = 1
+        self.normal_offset = 1
+        self.current_material = None
+
+        self.file.write("# VOTV Print Exporter\n")
+        if mtl_filename:
+            self.file.write(f"mtllib {mtl_filename}\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.bytes_written = self.file.tell()
+        self.file.close()
+
+    def write_rows(self, fmt, rows):
+        for start in range(0, len(rows), CHUNK_ROWS):
+            chunk = rows[start:start + CHUNK_ROWS]
+            self.file.write((fmt * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+    def begin_object(self, name):
+        self.file.write(f"o {name}\n")
+        self.current_material = None
+
+    def write_mesh(self, mesh, use_materials=True):
+        if self.precision is None:
+            positions, loop_vertices = mesh.positions, mesh.loop_vertices
+            self.write_rows("v %.6f %.6f %.6f\n", positions)
+        else:
+            positions, vertex_weld = weld_rows(mesh.positions, self.precision)
+            loop_vertices = vertex_weld[mesh.loop_vertices]
+            self.write_rows(f"v %.{self.precision}f %.{self.precision}f %.{self.precision}f\n", positions)
+
+        uv_index = normal_index = None
+        if mesh.uvs is not None:
+            if self.precision is None:
+                uv_values, uv_index = unique_rows(mesh.uvs)
+                self.write_rows("vt %.6f %.6f\n", uv_values)
+            else:
+                uv_values, uv_index = weld_rows(mesh.uvs, self.precision)
+                self.write_rows(f"vt %.{self.precision}f %.{self.precision}f\n", uv_values)
+        if mesh.normals is not None:
+            if self.precision is None:
+                normal_values, normal_index = unique_rows(mesh.normals, 4)
+                self.write_rows("vn %.4f %.4f %.4f\n", normal_values)
+            else:
+                normal_precision = min(self.precision, 4)
+                normal_values, normal_index = weld_rows(mesh.normals, normal_precision)
+                self.write_rows(f"vn %.{normal_precision}f %.{normal_precision}f %.{normal_precision}f\n", normal_values)
+
+        vertex_index = loop_vertices + self.vertex_offset
+        if uv_index is not None:
+            uv_index = uv_index.ravel() + self.uv_offset
+        if normal_index is not None:
+            normal_index = normal_index.ravel() + self.normal_offset
+
+        # Faces grouped by material, then by corner count so each group formats in one go
+        order = np.argsort(mesh.face_materials, kind='stable')
+        materials = mesh.face_materials[order]
+        runs = np.flatnonzero(np.diff(materials)) + 1
+        for faces in np.split(order, runs):
+            if len(faces) == 0:
+                continue
+            slot = mesh.face_materials[faces[0]]
+            if use_materials and 0 <= slot < len(mesh.material_names) and mesh.material_names[slot]:
+                material_name = mesh.material_names[slot]
+                if material_name != self.current_material:
+                    self.file.write(f"usemtl {material_name}\n")
+                    self.current_material = material_name
+            self.write_faces(mesh, faces, vertex_index, uv_index, normal_index)
+
+        self.vertex_offset += len(positions)
+        if uv_index is not None:
+            self.uv_offset += len(uv_values)
+        if normal_index is not None:
+            self.normal_offset += len(normal_values)
+
+    def write_faces(self, mesh, faces, vertex_index, uv_index, normal_index):
+        sizes = mesh.face_sizes[faces]
+        for size in np.unique(sizes):
+            group = faces[sizes == size]
+            loops = mesh.face_starts[group][:, np.newaxis] + np.arange(size)
+
+            columns = [vertex_index[loops]]
+            if uv_index is not None and normal_index is not None:
+                corner = " %d/%d/%d"
+                columns += [uv_index[loops], normal_index[loops]]
+            elif uv_index is not None:
+                corner = " %d/%d"
+                columns.append(uv_index[loops])
+            elif normal_index is not None:
+                corner = " %d//%d"
+                columns.append(normal_index[loops])
+            else:
+                corner = " %d"
+
+            rows = np.stack(columns, axis=-1).reshape(len(group), -1)
+            self.write_rows("f" + corner * int(size) + "\n", rows)
+
+def write_mtl(filepath, material_names):
+    with open(filepath, 'w', newline='\n') as f:
+        f.write("# VOTV Print Exporter\n")
+        for name in material_names:
+            f.write(f"\nnewmtl {name}\nKd 0.800000 0.800000 0.800000\nd 1.000000\nillum 2\n")
@@ -0,0 +1,79 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTIBILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Plain PNG encoder working on NumPy pixel arrays. Nothing in here touches bpy,
+# so it is safe to call from worker threads (zlib releases the GIL while compressing).
+
+import struct
+import zlib
+import numpy as np
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+TILE_ROWS = 256
+
+def compression_to_zlib_level(compression):
+    # Same mapping Blender uses for its 0-100% PNG compression setting
+    return max(0, min(9, int(compression / 11.1111)))
+
+def paeth_filter(rows, previous_row, bpp):
+    x = rows.astype(np.int16)
+    up = np.empty_like(x)
+    up[0] = previous_row
+    up[1:] = x[:-1]
+
+    left = np.zeros_like(x)
+    left[:, bpp:] = x[:, :-bpp]
+    upper_left = np.zeros_like(x)
+    upper_left[:, bpp:] = up[:, :-bpp]
+
+    estimate = left + up - upper_left
+    distance_left = np.abs(estimate - left)
+    distance_up = np.abs(estimate - up)
+    distance_upper_left = np.abs(estimate - upper_left)
+
+    predictor = np.where((distance_left <= distance_up) & (distance_left <= distance_upper_left), left,
+                         np.where(distance_up <= distance_upper_left, up, upper_left))
+    return (x - predictor).astype(np.uint8)
+
+def chunk(tag, body):
+    return struct.pack(">I", len(body)) + tag + body + struct.pack(">I", zlib.crc32(tag + body) & 0xFFFFFFFF)
+
+def encode_png(pixels, compression=15):
+    # pixels is a (height, width, channels) uint8 array, top row first
+    height, width, channels = pixels.shape
+    row_bytes = width * channels
+    rows = pixels.reshape(height, row_bytes)
+
+    compressor = zlib.compressobj(compression_to_zlib_level(compression))
+    data = []
+    previous_row = np.zeros(row_bytes, dtype=np.int16)
+    filtered = np.empty((TILE_ROWS, row_bytes + 1), dtype=np.uint8)
+    filtered[:, 0] = 4  # Paeth filter on every scanline
+
+    for y in range(0, height, TILE_ROWS):
+        tile = rows[y:y + TILE_ROWS]
+        count = len(tile)
+        filtered[:count, 1:] = paeth_filter(tile, previous_row, channels)
+        previous_row = tile[-1].astype(np.int16)
+        data.append(compressor.compress(filtered[:count].tobytes()))
+    data.append(compressor.flush())
+
+    header = struct.pack(">IIBBBBB", width, height, 8, COLOR_TYPES[channels], 0, 0, 0)
+    return b"".join((PNG_SIGNATURE, chunk(b"IHDR", header), chunk(b"IDAT", b"".join(data)), chunk(b"IEND", b"")))
+
+def write_png(filepath, pixels, compression=15):
+    encoded = encode_png(pixels, compression)
+    with open(filepath, 'wb') as f:
+        f.write(encoded)
+    return len(encoded)